@@ -14,37 +14,60 @@ Other modules:
 - utils: Helper functions and configuration management
 """
 
-# Import core components from organized subpackages
-from .nodes import (
-    query_analyzer, topic_validator, quiz_generator, 
-    answer_validator, score_generator
-)
+from importlib import import_module
+from typing import Any, List
 
-from .edges import (
-    route_conversation, main_route_conversation,
-    route_after_query_analysis, route_after_topic_validation,
-    route_after_question_generation, route_after_answer_validation,
-    route_after_scoring, should_end_session, should_start_new_quiz,
-    should_continue_quiz, classify_error_type, validate_routing_decision
-)
-
-from .prompts import (
-    format_intent_classification_prompt, format_topic_extraction_prompt,
-    format_topic_validation_prompt, format_question_generation_prompt,
-    format_answer_validation_prompt, format_clarification_prompt,
-    format_summary_generation_prompt, PromptType, PromptTemplate, PromptManager,
-    validate_prompt_response, extract_json_from_response
-)
+# Exported names by defining submodule. They are imported on first access,
+# so "from src.utils import Config" does not load LangGraph/LangChain
+_LAZY_EXPORTS = {
+    # Node functions
+    **dict.fromkeys((
+        "query_analyzer", "topic_validator", "quiz_generator",
+        "answer_validator", "score_generator"
+    ), ".nodes"),
+    
+    # Edge functions
+    **dict.fromkeys((
+        "route_conversation", "main_route_conversation",
+        "route_after_query_analysis", "route_after_topic_validation",
+        "route_after_question_generation", "route_after_answer_validation",
+        "route_after_scoring", "should_end_session", "should_start_new_quiz",
+        "should_continue_quiz", "classify_error_type", "validate_routing_decision"
+    ), ".edges"),
+    
+    # Prompt functions and classes
+    **dict.fromkeys((
+        "format_intent_classification_prompt", "format_topic_extraction_prompt",
+        "format_topic_validation_prompt", "format_question_generation_prompt",
+        "format_answer_validation_prompt", "format_clarification_prompt",
+        "format_summary_generation_prompt", "PromptType", "PromptTemplate", "PromptManager",
+        "validate_prompt_response", "extract_json_from_response"
+    ), ".prompts"),
+    
+    # State management
+    **dict.fromkeys((
+        "QuizState", "validate_state_consistency", "validate_state_transition",
+        "serialize_state", "deserialize_state",
+        "create_initial_state", "create_test_state"
+    ), ".state"),
+    
+    # Workflow and utilities
+    **dict.fromkeys(("QuizWorkflow", "create_quiz_workflow"), ".workflow"),
+    **dict.fromkeys(("Config", "validate_environment_setup"), ".utils")
+}
 
-from .state import (
-    QuizState, validate_state_consistency, validate_state_transition,
-    serialize_state, deserialize_state,
-    create_initial_state, create_test_state
-)
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its submodule on first access"""
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# Import workflow and utilities
-from .workflow import QuizWorkflow, create_quiz_workflow
-from .utils import Config, validate_environment_setup
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 __all__ = [
     # Node functions
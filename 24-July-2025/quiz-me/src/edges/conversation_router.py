@@ -5,7 +5,8 @@ current state, user intent, and system conditions. It handles complex decision-m
 and provides error recovery mechanisms.
 """
 
-from typing import Dict, Optional, Literal, Callable, List, Any
+from typing import Dict, DefaultDict, Optional, Literal, Callable, List, Any
+from collections import Counter, defaultdict
 import logging
 from datetime import datetime
 
@@ -28,7 +29,7 @@ def route_conversation(state: QuizState) -> str:
     Returns:
         String identifier of the next node to execute
     """
-    logger.info(f"Routing from phase '{state.current_phase}' with intent '{state.user_intent}'")
+    logger.info("Routing from phase '%s' with intent '%s'", state.current_phase, state.user_intent)
     
     try:
         # Handle exit intent from any phase
@@ -43,27 +44,14 @@ def route_conversation(state: QuizState) -> str:
             return "topic_validator"
         
         # Route based on current phase
-        if state.current_phase == "topic_selection":
-            return route_from_topic_selection(state)
-        
-        elif state.current_phase == "topic_validation":
-            return route_from_topic_validation(state)
-        
-        elif state.current_phase == "quiz_active":
-            return route_from_quiz_active(state)
-        
-        elif state.current_phase == "question_answered":
-            return route_from_question_answered(state)
-        
-        elif state.current_phase == "quiz_complete":
-            return route_from_quiz_complete(state)
-        
-        else:
-            logger.warning(f"Unknown phase '{state.current_phase}' - routing to query analyzer")
+        phase_router = _PHASE_ROUTERS.get(state.current_phase)
+        if phase_router is None:
+            logger.warning("Unknown phase '%s' - routing to query analyzer", state.current_phase)
             return "query_analyzer"
+        return phase_router(state)
     
     except Exception as e:
-        logger.error(f"Routing error: {str(e)}")
+        logger.error("Routing error: %s", e)
         # Default fallback routing
         return "query_analyzer"
 
@@ -134,6 +122,15 @@ def route_from_quiz_complete(state: QuizState) -> str:
     else:
         return "end"
 
+# Phase-specific router for each known phase, used by route_conversation
+_PHASE_ROUTERS: Dict[str, Callable[[QuizState], str]] = {
+    "topic_selection": route_from_topic_selection,
+    "topic_validation": route_from_topic_validation,
+    "quiz_active": route_from_quiz_active,
+    "question_answered": route_from_question_answered,
+    "quiz_complete": route_from_quiz_complete
+}
+
 # === SPECIALIZED ROUTING FUNCTIONS ===
 
 def route_after_score_generation(state: QuizState) -> str:
@@ -176,14 +173,12 @@ def route_error_recovery(state: QuizState) -> str:
 
 def should_end_session(state: QuizState) -> bool:
     """Determine if session should end"""
-    conditions = [
-        state.user_intent == "exit",
-        state.retry_count >= 5,  # Too many errors
+    return (
+        state.user_intent == "exit" or
+        state.retry_count >= 5 or  # Too many errors
         (state.current_phase == "quiz_complete" and 
-         state.user_intent not in ["new_quiz", "start_quiz"])
-    ]
-    
-    return any(conditions)
+         state.user_intent not in ("new_quiz", "start_quiz"))
+    )
 
 def should_start_new_quiz(state: QuizState) -> bool:
     """Determine if new quiz should start"""
@@ -287,7 +282,7 @@ def handle_infinite_quiz_termination(state: QuizState) -> str:
 
 def validate_routing_decision(state: QuizState, next_node: str) -> bool:
     """Validate that routing decision is appropriate for current state"""
-    logger.debug(f"Validating routing decision: {next_node}")
+    logger.debug("Validating routing decision: %s", next_node)
     
     # Define valid transitions
     valid_transitions = {
@@ -301,7 +296,7 @@ def validate_routing_decision(state: QuizState, next_node: str) -> bool:
     valid_next_nodes = valid_transitions.get(state.current_phase, [])
     
     if next_node not in valid_next_nodes and next_node != "query_analyzer":
-        logger.warning(f"Invalid transition from {state.current_phase} to {next_node}")
+        logger.warning("Invalid transition from %s to %s", state.current_phase, next_node)
         return False
     
     # Check node-specific prerequisites
@@ -314,7 +309,7 @@ def validate_routing_decision(state: QuizState, next_node: str) -> bool:
     
     requirement_check = node_requirements.get(next_node)
     if requirement_check and not requirement_check(state):
-        logger.warning(f"Prerequisites not met for node {next_node}")
+        logger.warning("Prerequisites not met for node %s", next_node)
         return False
     
     return True
@@ -325,34 +320,25 @@ class RoutingMetrics:
     """Track routing decisions for monitoring and optimization"""
     
     def __init__(self):
-        self.routing_counts: Dict[str, int] = {}
-        self.error_routes: Dict[str, int] = {}
-        self.phase_transitions: Dict[str, Dict[str, int]] = {}
+        self.routing_counts: Counter = Counter()
+        self.error_routes: Counter = Counter()
+        self.phase_transitions: DefaultDict[str, Counter] = defaultdict(Counter)
     
     def record_routing(self, from_phase: str, to_node: str, user_intent: str):
         """Record a routing decision"""
-        route_key = f"{from_phase}->{to_node}"
-        self.routing_counts[route_key] = self.routing_counts.get(route_key, 0) + 1
-        
-        if from_phase not in self.phase_transitions:
-            self.phase_transitions[from_phase] = {}
-        self.phase_transitions[from_phase][to_node] = (
-            self.phase_transitions[from_phase].get(to_node, 0) + 1
-        )
+        self.routing_counts[f"{from_phase}->{to_node}"] += 1
+        self.phase_transitions[from_phase][to_node] += 1
     
     def record_error_route(self, error_type: str):
         """Record an error-based routing decision"""
-        self.error_routes[error_type] = self.error_routes.get(error_type, 0) + 1
+        self.error_routes[error_type] += 1
     
     def get_routing_stats(self) -> Dict[str, Any]:
         """Get routing statistics"""
         return {
             "total_routes": sum(self.routing_counts.values()),
-            "most_common_routes": sorted(
-                self.routing_counts.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:10],
+            # Partial selection of the top 10 instead of sorting every route
+            "most_common_routes": self.routing_counts.most_common(10),
             "error_routes": self.error_routes,
             "phase_transitions": self.phase_transitions
         }
@@ -7,7 +7,7 @@ generation results, failure recovery, and quiz flow management.
 from typing import Optional, Dict, List
 import logging
 
-from ..state import QuizState
+from ..state import QuizState, DifficultyLevel
 
 logger = logging.getLogger(__name__)
 
@@ -254,11 +254,11 @@ def retry_question_generation(state: QuizState) -> str:
     logger.info(f"Retrying question generation (attempt {state.retry_count})")
     return "quiz_generator"
 
-def adjust_difficulty_up(state: QuizState):
+def adjust_difficulty_up(state: QuizState) -> None:
     """Adjust quiz difficulty upward"""
     current_level = state.quiz_metadata.get("difficulty_level", "medium")
     
-    difficulty_progression = {
+    difficulty_progression: Dict[DifficultyLevel, DifficultyLevel] = {
         "beginner": "medium",
         "easy": "medium", 
         "medium": "hard",
@@ -267,17 +267,17 @@ def adjust_difficulty_up(state: QuizState):
         "advanced": "expert"
     }
     
-    new_level = difficulty_progression.get(current_level, "hard")
+    new_level: DifficultyLevel = difficulty_progression.get(current_level, "hard")
     state.quiz_metadata["difficulty_level"] = new_level
     state.quiz_metadata["difficulty_adjusted"] = "increased"
     
     logger.info(f"Difficulty adjusted from {current_level} to {new_level}")
 
-def adjust_difficulty_down(state: QuizState):
+def adjust_difficulty_down(state: QuizState) -> None:
     """Adjust quiz difficulty downward"""
     current_level = state.quiz_metadata.get("difficulty_level", "medium")
     
-    difficulty_regression = {
+    difficulty_regression: Dict[DifficultyLevel, DifficultyLevel] = {
         "expert": "advanced",
         "advanced": "hard",
         "hard": "medium",
@@ -287,7 +287,7 @@ def adjust_difficulty_down(state: QuizState):
         "beginner": "beginner"  # Can't go lower
     }
     
-    new_level = difficulty_regression.get(current_level, "easy")
+    new_level: DifficultyLevel = difficulty_regression.get(current_level, "easy")
     state.quiz_metadata["difficulty_level"] = new_level
     state.quiz_metadata["difficulty_adjusted"] = "decreased"
     
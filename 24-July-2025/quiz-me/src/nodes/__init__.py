@@ -19,6 +19,7 @@ Each node follows a consistent pattern:
 
 from .query_analyzer import (
     query_analyzer, 
+    classify_intents_batch,
     validate_query_analyzer_prerequisites,
     QueryAnalyzerError
 )
@@ -111,6 +112,7 @@ __all__ = [
     "quiz_generator",
     "answer_validator",
     "score_generator",
+    "classify_intents_batch",
     
     # Prerequisite validators
     "validate_query_analyzer_prerequisites",
@@ -5,10 +5,11 @@ intent and context. This is typically the first node in the workflow that proces
 user messages.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import asyncio
 import logging
 from datetime import datetime
+from functools import lru_cache
 from langchain_openai import ChatOpenAI
 
 from ..state import QuizState
@@ -25,8 +26,16 @@ class LLMCallError(QueryAnalyzerError):
     """Error in LLM communication"""
     pass
 
+@lru_cache(maxsize=1)
 def create_llm_client() -> ChatOpenAI:
-    """Create and configure LLM client"""
+    """
+    Create and configure LLM client.
+    
+    The client is built once per process and shared by every node call made
+    without an explicit ``llm``, so its HTTP connection pool is reused. Code
+    that changes Config afterwards (e.g. test fixtures) must call
+    ``create_llm_client.cache_clear()`` for the change to take effect.
+    """
     return ChatOpenAI(
         api_key=Config.OPENAI_API_KEY,
         model=Config.OPENAI_MODEL,
@@ -117,6 +126,43 @@ def query_analyzer(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizSt
         state.user_intent = "clarification"
         return state
 
+async def classify_intents_batch(states: List[QuizState], 
+                                 llm: Optional[ChatOpenAI] = None) -> List[Dict[str, Any]]:
+    """
+    Classify intents for several sessions concurrently.
+    
+    Intended for server mode where many sessions are waiting on the LLM at
+    once: all prompts share one client and are awaited together instead of
+    one after another.
+    
+    Args:
+        states: Quiz states with user_input populated
+        llm: Language model client (optional, will create if not provided)
+        
+    Returns:
+        Parsed classification results in the same order as ``states``; failed
+        calls yield a dict with an "error" key
+    """
+    if llm is None:
+        llm = create_llm_client()
+    
+    prompts = [format_intent_classification_prompt(state) for state in states]
+    responses = await asyncio.gather(
+        *(safe_llm_call(llm, prompt) for prompt in prompts),
+        return_exceptions=True
+    )
+    
+    results = []
+    for response in responses:
+        # BaseException: a cancelled call comes back as CancelledError
+        if isinstance(response, BaseException):
+            logger.error("Batched intent classification failed: %s", response)
+            results.append({"error": str(response)})
+        else:
+            results.append(extract_json_from_response(response))
+    
+    return results
+
 def validate_query_analyzer_prerequisites(state: QuizState) -> list[str]:
     """Validate that state meets query analyzer prerequisites"""
     errors = []
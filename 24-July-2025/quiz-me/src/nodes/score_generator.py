@@ -10,7 +10,7 @@ import logging
 from datetime import datetime
 from langchain_openai import ChatOpenAI
 
-from ..state import QuizState
+from ..state import QuizState, DifficultyLevel
 from ..utils import Config
 
 logger = logging.getLogger(__name__)
@@ -22,7 +22,7 @@ class ScoreGeneratorError(Exception):
 def get_difficulty_multiplier(state: QuizState) -> float:
     """Get scoring multiplier based on difficulty level"""
     difficulty = state.quiz_metadata.get('difficulty_level', 'medium')
-    multipliers = {
+    multipliers: Dict[DifficultyLevel, float] = {
         'beginner': 0.8,
         'easy': 0.8,
         'medium': 1.0,
@@ -7,6 +7,7 @@ and feasibility for quiz generation.
 from typing import Dict, Any, Optional
 import asyncio
 import logging
+import sys
 from datetime import datetime
 from langchain_openai import ChatOpenAI
 
@@ -35,7 +36,7 @@ def topic_validator(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizS
     Returns:
         Updated state with topic validation results
     """
-    logger.info(f"Topic Validator processing input: '{state.user_input}'")
+    logger.info("Topic Validator processing input: '%s'", state.user_input)
     
     if llm is None:
         llm = create_llm_client()
@@ -53,10 +54,10 @@ def topic_validator(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizS
             return state
         
         # Store extracted topic
-        extracted_topic = extraction_result["topic"]
+        extracted_topic = sys.intern(str(extraction_result["topic"]))
         state.topic = extracted_topic
         
-        logger.info(f"Extracted topic: '{extracted_topic}'")
+        logger.info("Extracted topic: '%s'", extracted_topic)
         
         # Validate topic appropriateness
         validation_prompt = format_topic_validation_prompt(extracted_topic)
@@ -64,7 +65,7 @@ def topic_validator(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizS
         validation_result = extract_json_from_response(validation_response)
         
         if "error" in validation_result:
-            logger.error(f"Topic validation failed: {validation_result['error']}")
+            logger.error("Topic validation failed: %s", validation_result['error'])
             state.last_error = "Failed to validate topic appropriateness"
             state.current_phase = "topic_selection"
             return state
@@ -75,7 +76,7 @@ def topic_validator(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizS
         
         if is_valid:
             # Topic is valid - set up quiz
-            logger.info(f"Topic '{extracted_topic}' validated successfully")
+            logger.info("Topic '%s' validated successfully", extracted_topic)
             state.current_phase = "quiz_active"
             state.quiz_active = True
             
@@ -93,7 +94,7 @@ def topic_validator(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizS
             
         else:
             # Topic is invalid
-            logger.warning(f"Topic '{extracted_topic}' validation failed")
+            logger.warning("Topic '%s' validation failed", extracted_topic)
             reason = validation_result.get("reason", "Topic not suitable for quiz generation")
             suggestions = validation_result.get("suggestions", [])
             
@@ -107,7 +108,7 @@ def topic_validator(state: QuizState, llm: Optional[ChatOpenAI] = None) -> QuizS
         return state
         
     except Exception as e:
-        logger.error(f"Topic validator error: {str(e)}")
+        logger.error("Topic validator error: %s", e)
         state.last_error = f"Topic validation failed: {str(e)}"
         state.current_phase = "topic_selection"
         state.topic_validated = False
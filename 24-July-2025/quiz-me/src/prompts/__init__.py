@@ -1,7 +1,7 @@
 """LLM prompt templates and management system"""
 
 from typing import Dict, List, Optional, Any
-import json
+import orjson
 import re
 from .prompt_types import PromptType, PromptTemplate
 from .prompt_manager import PromptManager, prompt_manager
@@ -22,15 +22,18 @@ from .formatters import (
 )
 from ..state import QuizState
 
+# Outermost {...} block in a free-form LLM reply
+_JSON_BLOCK_PATTERN = re.compile(r'\{.*\}', re.DOTALL)
+
 # === PROMPT VALIDATION ===
 
 def validate_prompt_response(response: str, expected_format: str = "json") -> bool:
     """Validate LLM response format"""
     if expected_format == "json":
         try:
-            json.loads(response)
+            orjson.loads(response)
             return True
-        except (json.JSONDecodeError, TypeError):
+        except (orjson.JSONDecodeError, TypeError):
             return False
     
     # For text responses, just check it's not empty
@@ -42,16 +45,16 @@ def extract_json_from_response(response: str) -> Dict[str, Any]:
     
     # Try direct parsing first
     try:
-        return json.loads(response)
-    except json.JSONDecodeError:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError:
         pass
     
     # Try to find JSON within the response
-    json_match = re.search(r'\{.*\}', response, re.DOTALL)
+    json_match = _JSON_BLOCK_PATTERN.search(response)
     if json_match:
         try:
-            return json.loads(json_match.group())
-        except json.JSONDecodeError:
+            return orjson.loads(json_match.group())
+        except orjson.JSONDecodeError:
             pass
     
     # Return error structure
@@ -66,11 +69,12 @@ def create_test_prompts() -> Dict[str, str]:
     """Create test prompts for validation"""
     from ..state import create_test_state
     
-    test_state = create_test_state()
-    test_state.user_input = "I want a quiz about Python programming"
-    test_state.current_question = "What is a list in Python?"
-    test_state.current_answer = "A collection of items"
-    test_state.correct_answer = "An ordered collection of items"
+    test_state = create_test_state(
+        user_input="I want a quiz about Python programming",
+        current_question="What is a list in Python?",
+        current_answer="A collection of items",
+        correct_answer="An ordered collection of items"
+    )
     
     return {
         "intent_classification": format_intent_classification_prompt(test_state),
@@ -10,6 +10,16 @@ from .templates import (
     QUIZ_SUMMARY_PROMPT
 )
 
+# Default values for optional template variables
+OPTIONAL_VAR_DEFAULTS: Dict[str, str] = {
+    "question_type": "open_ended",
+    "options": "None",
+    "current_question": "No current question",
+    "question_type_breakdown": "Not available",
+    "strong_areas": "General knowledge",
+    "weak_areas": "None identified"
+}
+
 class PromptManager:
     """Manages all prompt templates and formatting"""
     
@@ -94,7 +104,7 @@ class PromptManager:
         template = self.templates[prompt_type]
         
         # Validate required variables
-        missing_vars = [var for var in template.required_vars if var not in kwargs]
+        missing_vars = template.missing_vars(kwargs)
         if missing_vars:
             raise ValueError(f"Missing required variables for {prompt_type.value}: {missing_vars}")
         
@@ -104,21 +114,13 @@ class PromptManager:
                 kwargs[var] = self._get_default_value(var)
         
         try:
-            return template.template.format(**kwargs)
+            return template.format(**kwargs)
         except KeyError as e:
             raise ValueError(f"Template formatting failed for {prompt_type.value}: {str(e)}")
     
     def _get_default_value(self, var_name: str) -> str:
         """Get default value for optional variables"""
-        defaults = {
-            "question_type": "open_ended",
-            "options": "None",
-            "current_question": "No current question",
-            "question_type_breakdown": "Not available",
-            "strong_areas": "General knowledge",
-            "weak_areas": "None identified"
-        }
-        return defaults.get(var_name, "Not specified")
+        return OPTIONAL_VAR_DEFAULTS.get(var_name, "Not specified")
 
 # Initialize global prompt manager
 prompt_manager = PromptManager() 
\ No newline at end of file
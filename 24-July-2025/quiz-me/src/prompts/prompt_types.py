@@ -1,9 +1,12 @@
 """Shared types and enumerations for prompt management"""
 
-from typing import List, Optional
-from dataclasses import dataclass
+import string
+from typing import Any, FrozenSet, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+_FORMATTER = string.Formatter()
+
 class PromptType(Enum):
     """Types of prompts in the system"""
     INTENT_CLASSIFICATION = "intent_classification"
@@ -23,7 +26,42 @@ class PromptTemplate:
     optional_vars: List[str] = None
     description: str = ""
     expected_output: str = "json"
+    _parsed: List[Tuple[str, Optional[str], Optional[str], Optional[str]]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _required_var_set: FrozenSet[str] = field(
+        default=frozenset(), init=False, repr=False, compare=False
+    )
     
     def __post_init__(self):
         if self.optional_vars is None:
-            self.optional_vars = [] 
\ No newline at end of file
+            self.optional_vars = []
+        # Parse once; format() then only joins literals and values
+        self._parsed = list(_FORMATTER.parse(self.template))
+        self._required_var_set = frozenset(self.required_vars)
+    
+    def missing_vars(self, provided: Mapping[str, Any]) -> List[str]:
+        """Required variables absent from the provided mapping, in declared order"""
+        if provided.keys() >= self._required_var_set:
+            return []
+        return [var for var in self.required_vars if var not in provided]
+    
+    def format(self, **kwargs: Any) -> str:
+        """Fill the template from keyword arguments (KeyError if one is missing)"""
+        parts = []
+        for literal_text, field_name, format_spec, conversion in self._parsed:
+            parts.append(literal_text)
+            if field_name is None:
+                continue
+            if field_name in kwargs:
+                value = kwargs[field_name]
+            else:
+                # Dotted/indexed fields, or a missing name (raises KeyError)
+                value = _FORMATTER.get_field(field_name, (), kwargs)[0]
+            if conversion:
+                value = _FORMATTER.convert_field(value, conversion)
+            if format_spec and "{" in format_spec:
+                # Nested fields in the spec, e.g. "{value:{width}}"
+                format_spec = _FORMATTER.vformat(format_spec, (), kwargs)
+            parts.append(format(value, format_spec or ""))
+        return "".join(parts) 
\ No newline at end of file
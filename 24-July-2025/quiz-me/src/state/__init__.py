@@ -1,16 +1,32 @@
 """State management package for the Interactive Quiz Generator"""
 
 from .quiz_state import QuizState
-from .state_validators import validate_state_consistency, validate_state_transition
-from .state_serializers import serialize_state, deserialize_state
+from .state_types import UserIntent, QuizPhase, QuestionType, QuizType, DifficultyLevel
+from .state_validators import (
+    validate_state_consistency, first_validation_error, validate_state_transition
+)
+from .state_serializers import (
+    serialize_state, serialize_state_bytes, deserialize_state, peek_serialized_at,
+    deserialize_state_lazy, LazyQuizState
+)
 from .state_factory import create_initial_state, create_test_state
 
 __all__ = [
     "QuizState",
+    "UserIntent",
+    "QuizPhase",
+    "QuestionType",
+    "QuizType",
+    "DifficultyLevel",
     "validate_state_consistency", 
+    "first_validation_error",
     "validate_state_transition",
     "serialize_state",
+    "serialize_state_bytes",
     "deserialize_state",
+    "peek_serialized_at",
+    "deserialize_state_lazy",
+    "LazyQuizState",
     "create_initial_state",
     "create_test_state"
 ] 
\ No newline at end of file
@@ -1,9 +1,48 @@
 """Core QuizState class for the Interactive Quiz Generator"""
 
-from typing import List, Dict, Optional, Literal, Any
+from typing import List, Dict, Optional, Any, Tuple, get_args
+from collections import Counter
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-import uuid
+import secrets
+import sys
+
+from .state_types import UserIntent, QuizPhase, QuestionType, QuizType
+
+# Conversation turns kept per session; older entries are dropped first
+MAX_CONVERSATION_HISTORY = 256
+
+# Interned categorical labels shared by every history record
+_INTERNED_PHASES = {p: sys.intern(p) for p in get_args(QuizPhase)}
+_INTERNED_QUESTION_TYPES = {t: sys.intern(t) for t in get_args(QuestionType)}
+
+# Per-question fields cleared when moving to the next question
+_QUESTION_SLOT_DEFAULTS: Dict[str, Any] = {
+    "current_question": None,
+    "question_type": None,
+    "question_options": None,
+    "correct_answer": None,
+    "current_answer": None,
+    "answer_is_correct": None,
+    "answer_feedback": None
+}
+
+# Immutable quiz fields restored by reset_for_new_quiz (mutable ones are rebuilt per call)
+_QUIZ_RESET_DEFAULTS: Dict[str, Any] = {
+    **_QUESTION_SLOT_DEFAULTS,
+    "topic": None,
+    "topic_validated": False,
+    "current_question_index": 0,
+    "total_score": 0,
+    "total_questions_answered": 0,
+    "correct_answers_count": 0,
+    "quiz_completion_percentage": 0.0,
+    "quiz_active": False,
+    "quiz_completed": False,
+    "current_phase": "topic_selection",
+    "last_error": None,
+    "retry_count": 0
+}
 
 class QuizState(BaseModel):
     """
@@ -16,29 +55,21 @@ class QuizState(BaseModel):
     
     # === User Input & Intent ===
     user_input: str = Field(default="", description="Latest user input text")
-    user_intent: Optional[Literal[
-        "start_quiz", "answer_question", "new_quiz", 
-        "exit", "continue", "clarification"
-    ]] = Field(default=None, description="Classified user intention")
+    user_intent: Optional[UserIntent] = Field(default=None, description="Classified user intention")
     
     # === Current Phase Tracking ===
-    current_phase: Literal[
-        "topic_selection", "topic_validation", "quiz_active", 
-        "question_answered", "quiz_complete"
-    ] = Field(default="topic_selection", description="Current application phase")
+    current_phase: QuizPhase = Field(default="topic_selection", description="Current application phase")
     
     # === Quiz Configuration ===
     topic: Optional[str] = Field(default=None, description="Quiz topic")
     topic_validated: bool = Field(default=False, description="Topic validation status")
-    quiz_type: Literal["finite", "infinite"] = Field(default="finite", description="Quiz duration type")
+    quiz_type: QuizType = Field(default="finite", description="Quiz duration type")
     max_questions: Optional[int] = Field(default=10, description="Maximum questions for finite quizzes")
     
     # === Question Management ===
     current_question_index: int = Field(default=0, description="Current question number (0-based)")
     current_question: Optional[str] = Field(default=None, description="Current question text")
-    question_type: Optional[Literal[
-        "multiple_choice", "open_ended", "true_false", "fill_in_blank"
-    ]] = Field(default=None, description="Current question format")
+    question_type: Optional[QuestionType] = Field(default=None, description="Current question format")
     question_options: Optional[List[str]] = Field(default=None, description="Multiple choice options")
     correct_answer: Optional[str] = Field(default=None, description="Correct answer for current question")
     
@@ -57,7 +88,7 @@ class QuizState(BaseModel):
     # === Session Management ===
     quiz_active: bool = Field(default=False, description="Quiz session status")
     quiz_completed: bool = Field(default=False, description="Quiz completion status")
-    session_id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique session identifier")
+    session_id: Optional[str] = Field(default_factory=lambda: secrets.token_hex(16), description="Unique session identifier")
     
     # === Error Handling ===
     last_error: Optional[str] = Field(default=None, description="Last error message")
@@ -72,6 +103,8 @@ class QuizState(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now, description="Last update timestamp")
     
     model_config = ConfigDict(
+        # Snapshot metadata (_serialized_at, _version) is dropped on deserialize
+        extra="ignore",
         # Generate schema for OpenAPI docs  
         json_schema_extra = {
             "example": {
@@ -88,6 +121,12 @@ class QuizState(BaseModel):
     
     # === Validators ===
     
+    @field_validator('session_id', 'topic', mode='before')
+    @classmethod
+    def intern_shared_strings(cls, v: Any) -> Any:
+        """Intern identifiers repeated across states and records"""
+        return sys.intern(v) if isinstance(v, str) else v
+    
     @field_validator('quiz_completion_percentage')
     @classmethod
     def validate_percentage(cls, v: float) -> float:
@@ -124,26 +163,31 @@ class QuizState(BaseModel):
     
     # === State Management Methods ===
     
-    def update_timestamp(self) -> None:
+    def update_timestamp(self, now: Optional[datetime] = None) -> None:
         """Update the last modified timestamp"""
-        self.updated_at = datetime.now()
+        self.updated_at = now or datetime.now()
     
     def add_conversation_entry(self, user_input: str, system_response: str = "") -> None:
         """Add entry to conversation history"""
+        now = datetime.now()
         entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "user": user_input,
             "system": system_response,
-            "phase": self.current_phase,
+            "phase": _INTERNED_PHASES.get(self.current_phase, self.current_phase),
             "question_index": self.current_question_index
         }
-        self.conversation_history.append(entry)
-        self.update_timestamp()
+        history = self.conversation_history
+        history.append(entry)
+        if len(history) > MAX_CONVERSATION_HISTORY:
+            del history[:-MAX_CONVERSATION_HISTORY]
+        self.update_timestamp(now)
     
     def add_answer_record(self, question: str, user_answer: str, 
                          correct_answer: str, is_correct: bool, 
                          feedback: str = "", explanation: str = "") -> None:
         """Add complete answer record to history"""
+        now = datetime.now()
         answer_record = {
             "question_index": self.current_question_index,
             "question": question,
@@ -152,56 +196,49 @@ class QuizState(BaseModel):
             "is_correct": is_correct,
             "feedback": feedback,
             "explanation": explanation,
-            "question_type": self.question_type,
-            "timestamp": datetime.now().isoformat()
+            "question_type": _INTERNED_QUESTION_TYPES.get(self.question_type, self.question_type),
+            "timestamp": now.isoformat()
         }
         self.user_answers.append(answer_record)
-        self.update_timestamp()
+        self.update_timestamp(now)
     
     def reset_for_new_quiz(self) -> None:
         """Reset state for starting a new quiz"""
-        # Preserve session info
-        session_id = self.session_id
-        conversation_history = self.conversation_history.copy()
-        
-        # Reset quiz-specific fields
-        self.topic = None
-        self.topic_validated = False
-        self.current_question_index = 0
-        self.current_question = None
-        self.question_type = None
-        self.question_options = None
-        self.correct_answer = None
+        # Reset quiz-specific fields (all values are already valid, so skip per-field setattr);
+        # session_id and conversation_history are not in the defaults, so they are kept in place
+        self.__dict__.update(_QUIZ_RESET_DEFAULTS)
         self.user_answers = []
-        self.current_answer = None
-        self.answer_is_correct = None
-        self.answer_feedback = None
-        self.total_score = 0
-        self.total_questions_answered = 0
-        self.correct_answers_count = 0
-        self.quiz_completion_percentage = 0.0
-        self.quiz_active = False
-        self.quiz_completed = False
-        self.current_phase = "topic_selection"
-        self.last_error = None
-        self.retry_count = 0
         self.quiz_metadata = {}
-        
-        # Restore preserved fields
-        self.session_id = session_id
-        self.conversation_history = conversation_history
         self.update_timestamp()
     
+    def apply_update(self, conversation_entry: Optional[Tuple[str, str]] = None,
+                     **fields: Any) -> None:
+        """
+        Record a conversation turn and set several fields in one step.
+        
+        Args:
+            conversation_entry: Optional (user_input, system_response) pair,
+                recorded before the fields change so it keeps the current phase
+            **fields: Field values to set; callers pass already-valid values
+            
+        Raises:
+            ValueError: If a keyword is not a QuizState field
+        """
+        unknown = fields.keys() - _FIELD_NAMES
+        if unknown:
+            raise ValueError(f"Unknown QuizState fields: {sorted(unknown)}")
+        
+        if conversation_entry is not None:
+            self.add_conversation_entry(*conversation_entry)
+        self.__dict__.update(fields)
+    
     def increment_question(self) -> None:
         """Move to next question"""
-        self.current_question_index += 1
-        self.current_question = None
-        self.question_type = None
-        self.question_options = None
-        self.correct_answer = None
-        self.current_answer = None
-        self.answer_is_correct = None
-        self.answer_feedback = None
+        # Clear the per-question slots and advance the index in one dict update
+        self.__dict__.update(
+            _QUESTION_SLOT_DEFAULTS,
+            current_question_index=self.current_question_index + 1
+        )
         self.update_timestamp()
     
     def calculate_accuracy(self) -> float:
@@ -214,16 +251,18 @@ class QuizState(BaseModel):
         """Generate performance summary statistics"""
         accuracy = self.calculate_accuracy()
         
-        # Analyze question type performance
-        type_performance = {}
-        for answer in self.user_answers:
-            q_type = answer.get('question_type', 'unknown')
-            if q_type not in type_performance:
-                type_performance[q_type] = {"correct": 0, "total": 0}
-            
-            type_performance[q_type]["total"] += 1
-            if answer.get('is_correct', False):
-                type_performance[q_type]["correct"] += 1
+        # Analyze question type performance: pull the type column once,
+        # then let Counter tally totals and correct answers per type
+        q_types = [answer.get('question_type', 'unknown') for answer in self.user_answers]
+        totals = Counter(q_types)
+        corrects = Counter(
+            q_type for q_type, answer in zip(q_types, self.user_answers)
+            if answer.get('is_correct', False)
+        )
+        type_performance = {
+            q_type: {"correct": corrects[q_type], "total": total}
+            for q_type, total in totals.items()
+        }
         
         return {
             "total_questions": self.total_questions_answered,
@@ -236,4 +275,5 @@ class QuizState(BaseModel):
             "topic": self.topic
         }
 
- 
\ No newline at end of file
+# Field names, fixed once the model class is built
+_FIELD_NAMES = frozenset(QuizState.model_fields)
@@ -4,8 +4,19 @@ This module provides factory functions for creating QuizState instances
 for different scenarios like testing, initialization, and specific use cases.
 """
 
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from .quiz_state import QuizState
+from .state_types import QuizPhase
+
+# Field values shared by every state built with create_test_state
+_TEST_STATE_DEFAULTS: Dict[str, Any] = {
+    "topic": "Test Topic",
+    "topic_validated": True,
+    "quiz_active": True,
+    "current_question": "Test question?",
+    "question_type": "open_ended",
+    "correct_answer": "Test answer"
+}
 
 def create_initial_state(session_id: Optional[str] = None) -> QuizState:
     """
@@ -17,13 +28,12 @@ def create_initial_state(session_id: Optional[str] = None) -> QuizState:
     Returns:
         Fresh QuizState object
     """
-    state = QuizState()
     if session_id:
-        state.session_id = session_id
-    return state
+        return QuizState(session_id=session_id)
+    return QuizState()
 
 
-def create_test_state(phase: str = "quiz_active", **kwargs: Any) -> QuizState:
+def create_test_state(phase: QuizPhase = "quiz_active", **kwargs: Any) -> QuizState:
     """
     Create state for testing purposes.
     
@@ -34,17 +44,8 @@ def create_test_state(phase: str = "quiz_active", **kwargs: Any) -> QuizState:
     Returns:
         QuizState configured for testing
     """
-    defaults = {
-        "topic": "Test Topic",
-        "topic_validated": True,
-        "quiz_active": True,
-        "current_question": "Test question?",
-        "question_type": "open_ended",
-        "correct_answer": "Test answer"
-    }
-    
     # Merge defaults with provided kwargs
-    test_data = {**defaults, **kwargs, "current_phase": phase}
+    test_data = {**_TEST_STATE_DEFAULTS, **kwargs, "current_phase": phase}
     return QuizState(**test_data)
 
 __all__ = [
@@ -1,8 +1,8 @@
 # src/state_middleware.py
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable
 from .quiz_state import QuizState
-from .state_validators import validate_state_consistency
+from .state_validators import first_validation_error
 
 def validate_state_middleware(func: Callable[[QuizState], QuizState]) -> Callable[[QuizState], QuizState]:
     """Middleware to validate state before and after node execution"""
@@ -10,18 +10,18 @@ def validate_state_middleware(func: Callable[[QuizState], QuizState]) -> Callabl
     @wraps(func)
     def wrapper(state: QuizState) -> QuizState:
         # Pre-execution validation
-        pre_errors = validate_state_consistency(state)
-        if pre_errors:
-            state.last_error = f"Pre-execution validation failed: {pre_errors[0]}"
+        pre_error = first_validation_error(state)
+        if pre_error:
+            state.last_error = f"Pre-execution validation failed: {pre_error}"
             return state
         
         # Execute node
         result_state = func(state)
         
         # Post-execution validation
-        post_errors = validate_state_consistency(result_state)
-        if post_errors:
-            result_state.last_error = f"Post-execution validation failed: {post_errors[0]}"
+        post_error = first_validation_error(result_state)
+        if post_error:
+            result_state.last_error = f"Post-execution validation failed: {post_error}"
         
         return result_state
     
@@ -4,9 +4,47 @@ This module provides functions for serializing and deserializing QuizState
 objects to and from JSON format for persistence and transport.
 """
 
-import json
 from datetime import datetime
-from .quiz_state import QuizState
+from typing import Any, Dict, Optional, Union
+import orjson
+from .quiz_state import QuizState, _FIELD_NAMES
+
+# Non-str keys in quiz_metadata are stringified like json.dumps did
+_COMPACT_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS
+# Pretty-printed output for files and logs
+_DUMP_OPTIONS = _COMPACT_DUMP_OPTIONS | orjson.OPT_INDENT_2
+
+# pydantic-core entry points, bound once to skip the model_dump/model_validate wrappers
+_STATE_SERIALIZER = QuizState.__pydantic_serializer__
+_STATE_VALIDATOR = QuizState.__pydantic_validator__
+
+# Serialization metadata is written first, so it always sits in this prefix
+_HEADER_BYTES = 128
+_SERIALIZED_AT_KEY = b'"_serialized_at"'
+
+def serialize_state_bytes(state: QuizState, compact: bool = False) -> bytes:
+    """
+    Serialize state to UTF-8 encoded JSON for file, socket or cache writes.
+    
+    Args:
+        state: QuizState object to serialize
+        compact: Omit indentation, for transport and session stores where
+            the payload is not read by people
+        
+    Returns:
+        JSON bytes representation
+    """
+    # Serialization metadata leads the payload so peek_serialized_at can read
+    # it from the prefix (orjson writes datetimes as ISO strings itself)
+    state_dict = {
+        '_serialized_at': datetime.now(),
+        '_version': "1.0",
+        **_STATE_SERIALIZER.to_python(state)
+    }
+    
+    options = _COMPACT_DUMP_OPTIONS if compact else _DUMP_OPTIONS
+    return orjson.dumps(state_dict, option=options, default=str)
+
 
 def serialize_state(state: QuizState) -> str:
     """
@@ -18,26 +56,16 @@ def serialize_state(state: QuizState) -> str:
     Returns:
         JSON string representation
     """
-    state_dict = state.model_dump()
-    
-    # Convert datetime objects to ISO strings
-    for key, value in state_dict.items():
-        if isinstance(value, datetime):
-            state_dict[key] = value.isoformat()
-    
-    # Add serialization metadata
-    state_dict['_serialized_at'] = datetime.now().isoformat()
-    state_dict['_version'] = "1.0"
-    
-    return json.dumps(state_dict, indent=2, default=str)
+    return serialize_state_bytes(state).decode()
 
 
-def deserialize_state(state_json: str) -> QuizState:
+def deserialize_state(state_json: Union[str, bytes]) -> QuizState:
     """
     Deserialize state from JSON string.
     
     Args:
-        state_json: JSON string representation
+        state_json: JSON string representation, or its UTF-8 bytes as read
+            from a file or cache (parsed without decoding to str first)
         
     Returns:
         QuizState object
@@ -46,23 +74,98 @@ def deserialize_state(state_json: str) -> QuizState:
         ValueError: If deserialization fails
     """
     try:
-        state_dict = json.loads(state_json)
+        # Serialization metadata keys are ignored as extra fields, and
+        # ISO timestamps are parsed back to datetime by the validator
+        state: QuizState = _STATE_VALIDATOR.validate_json(state_json)
+        return state
         
-        # Remove serialization metadata
-        state_dict.pop('_serialized_at', None)
-        state_dict.pop('_version', None)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Failed to deserialize state: {str(e)}")
+
+class LazyQuizState:
+    """
+    Read-only view over a serialized state for callers that read a few fields.
+    
+    The payload is parsed with orjson on first attribute access, skipping
+    QuizState validation; values keep their JSON types (timestamps stay ISO
+    strings). Use to_state() for a full, validated QuizState.
+    """
+    
+    __slots__ = ("_raw", "_fields")
+    
+    def __init__(self, state_json: Union[str, bytes]):
+        self._raw = state_json
+        self._fields: Optional[Dict[str, Any]] = None
+    
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names that are not slots or methods
+        fields = self._fields
+        if fields is None:
+            try:
+                fields = orjson.loads(self._raw)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Failed to deserialize state: {str(e)}")
+            if not isinstance(fields, dict):
+                raise ValueError("Failed to deserialize state: payload is not an object")
+            self._fields = fields
         
-        # Convert ISO strings back to datetime objects
-        for key in ['created_at', 'updated_at']:
-            if key in state_dict and isinstance(state_dict[key], str):
-                state_dict[key] = datetime.fromisoformat(state_dict[key])
+        if name not in _FIELD_NAMES or name not in fields:
+            raise AttributeError(f"'LazyQuizState' object has no attribute '{name}'")
+        return fields[name]
+    
+    def to_state(self) -> QuizState:
+        """Validate the full payload into a QuizState"""
+        return deserialize_state(self._raw)
+
+
+def deserialize_state_lazy(state_json: Union[str, bytes]) -> LazyQuizState:
+    """
+    Wrap a serialized state without parsing it.
+    
+    Args:
+        state_json: Output of serialize_state or serialize_state_bytes
         
-        return QuizState(**state_dict)
+    Returns:
+        LazyQuizState that parses the payload when a field is first read
+    """
+    return LazyQuizState(state_json)
+
+
+def peek_serialized_at(state_json: Union[str, bytes]) -> Optional[datetime]:
+    """
+    Read a snapshot's serialization time without parsing the whole payload.
+    
+    Args:
+        state_json: Output of serialize_state or serialize_state_bytes
         
-    except (json.JSONDecodeError, TypeError, ValueError) as e:
-        raise ValueError(f"Failed to deserialize state: {str(e)}")
+    Returns:
+        Time the snapshot was written, or None if the prefix has no
+        readable _serialized_at header
+    """
+    head = state_json[:_HEADER_BYTES]
+    if isinstance(head, str):
+        head = head.encode()
+    
+    key_end = head.find(_SERIALIZED_AT_KEY)
+    if key_end < 0:
+        return None
+    key_end += len(_SERIALIZED_AT_KEY)
+    
+    start = head.find(b'"', key_end) + 1
+    end = head.find(b'"', start)
+    if start == 0 or end < 0:
+        return None
+    
+    try:
+        return datetime.fromisoformat(head[start:end].decode())
+    except ValueError:
+        return None
 
 __all__ = [
     "serialize_state",
-    "deserialize_state"
+    "serialize_state_bytes",
+    "deserialize_state",
+    "deserialize_state_lazy",
+    "LazyQuizState",
+    "peek_serialized_at"
 ] 
\ No newline at end of file
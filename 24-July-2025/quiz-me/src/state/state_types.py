@@ -17,4 +17,17 @@ QuestionType = Literal[
     "multiple_choice", "open_ended", "true_false", "fill_in_blank"
 ]
 
-QuizType = Literal["finite", "infinite"] 
\ No newline at end of file
+QuizType = Literal["finite", "infinite"]
+
+DifficultyLevel = Literal[
+    "beginner", "easy", "medium", "intermediate", 
+    "hard", "advanced", "expert"
+]
+
+__all__ = [
+    "UserIntent",
+    "QuizPhase",
+    "QuestionType",
+    "QuizType",
+    "DifficultyLevel"
+]
@@ -4,56 +4,76 @@ This module provides validation functions for ensuring state consistency
 and proper transitions between states.
 """
 
-from typing import List
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Iterator, List, Optional
 from .quiz_state import QuizState
 
-def validate_state_consistency(state: QuizState) -> List[str]:
-    """
-    Validate state consistency across all fields.
-    
-    Args:
-        state: QuizState object to validate
-        
-    Returns:
-        List of validation error messages (empty if valid)
-    """
-    errors = []
-    
+# Fields that must be truthy in each phase, paired with prebuilt getters
+_PHASE_REQUIREMENTS = MappingProxyType({
+    phase: tuple((field, attrgetter(field)) for field in fields)
+    for phase, fields in {
+        "topic_selection": (),
+        "topic_validation": ("user_input",),
+        "quiz_active": ("topic", "topic_validated"),
+        "question_answered": ("current_answer", "answer_is_correct"),
+        "quiz_complete": ("quiz_completed",)
+    }.items()
+})
+
+def _iter_consistency_errors(state: QuizState) -> Iterator[str]:
+    """Yield consistency error messages in check order"""
     # Quiz activation validation
     if state.quiz_active and not state.topic_validated:
-        errors.append("Quiz cannot be active without validated topic")
+        yield "Quiz cannot be active without validated topic"
     
     # Question indexing validation
     if state.current_question_index > len(state.user_answers) + 1:
-        errors.append("Question index inconsistent with answer history")
+        yield "Question index inconsistent with answer history"
     
     # Scoring validation
     if state.correct_answers_count > state.total_questions_answered:
-        errors.append("Correct answers cannot exceed total answered")
+        yield "Correct answers cannot exceed total answered"
     
     if state.total_questions_answered != len(state.user_answers):
-        errors.append("Answer history length doesn't match total questions answered")
+        yield "Answer history length doesn't match total questions answered"
     
     # Phase validation
-    phase_requirements = {
-        "topic_selection": [],
-        "topic_validation": ["user_input"],
-        "quiz_active": ["topic", "topic_validated"],
-        "question_answered": ["current_answer", "answer_is_correct"],
-        "quiz_complete": ["quiz_completed"]
-    }
-    
-    required_fields = phase_requirements.get(state.current_phase, [])
-    for field in required_fields:
-        if not getattr(state, field):
-            errors.append(f"Phase '{state.current_phase}' requires field '{field}'")
+    required_fields = _PHASE_REQUIREMENTS.get(state.current_phase, ())
+    for field, get_field in required_fields:
+        if not get_field(state):
+            yield f"Phase '{state.current_phase}' requires field '{field}'"
     
     # Completion validation
     if state.quiz_type == "finite" and state.max_questions:
         if state.total_questions_answered > state.max_questions:
-            errors.append("Questions answered exceeds maximum for finite quiz")
+            yield "Questions answered exceeds maximum for finite quiz"
+
+
+def validate_state_consistency(state: QuizState) -> List[str]:
+    """
+    Validate state consistency across all fields.
     
-    return errors
+    Args:
+        state: QuizState object to validate
+        
+    Returns:
+        List of validation error messages (empty if valid)
+    """
+    return list(_iter_consistency_errors(state))
+
+
+def first_validation_error(state: QuizState) -> Optional[str]:
+    """
+    Return the first consistency error, stopping at the first failed check.
+    
+    Args:
+        state: QuizState object to validate
+        
+    Returns:
+        First validation error message, or None if the state is consistent
+    """
+    return next(_iter_consistency_errors(state), None)
 
 
 def validate_state_transition(old_state: QuizState, new_state: QuizState) -> List[str]:
@@ -67,6 +87,11 @@ def validate_state_transition(old_state: QuizState, new_state: QuizState) -> Lis
     Returns:
         List of validation error messages (empty if valid)
     """
+    # A node that mutated and returned the same object cannot violate any
+    # rule below, since every check compares a field with itself
+    if old_state is new_state:
+        return []
+    
     errors = []
     
     # Session ID should remain constant
@@ -90,5 +115,6 @@ def validate_state_transition(old_state: QuizState, new_state: QuizState) -> Lis
 
 __all__ = [
     "validate_state_consistency",
+    "first_validation_error",
     "validate_state_transition"
 ] 
\ No newline at end of file
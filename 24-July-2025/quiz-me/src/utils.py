@@ -15,12 +15,16 @@ Core utilities implemented for immediate use in setup phase.
 """
 
 import os
+import sys
 from typing import Optional, Dict, Any, List
 from dotenv import load_dotenv
 import logging
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once per process, even if this module is
+# imported under two names (``utils`` and ``src.utils``). The check stays
+# in-process so child processes still read their own .env.
+if ('utils' if __name__ == 'src.utils' else 'src.utils') not in sys.modules:
+    load_dotenv()
 
 # Configure logging
 logging.basicConfig(
@@ -98,6 +102,12 @@ except ValueError as e:
 # TODO: Add validation functions
 # TODO: Add performance monitoring utilities
 
+# Components reported by validate_environment_setup, in report order
+_VALIDATION_COMPONENTS = (
+    'python_version', 'openai_api_key', 'environment_file',
+    'requirements_file', 'src_directory', 'tests_directory'
+)
+
 def validate_environment_setup() -> Dict[str, bool]:
     """
     Validate that the development environment is properly set up.
@@ -105,31 +115,44 @@ def validate_environment_setup() -> Dict[str, bool]:
     Returns:
         Dict with validation results for different components
     """
-    results = {
-        'python_version': True,  # We're running Python if we get here
-        'openai_api_key': bool(Config.OPENAI_API_KEY),
-        'environment_file': os.path.exists('.env'),
-        'requirements_file': os.path.exists('requirements.txt'),
-        'src_directory': os.path.exists('src'),
-        'tests_directory': os.path.exists('tests'),
-    }
+    # One directory read instead of a stat() per expected entry
+    with os.scandir('.') as entries:
+        names = {entry.name for entry in entries}
     
-    return results
+    checks = (
+        True,  # We're running Python if we get here
+        bool(Config.OPENAI_API_KEY),
+        '.env' in names,
+        'requirements.txt' in names,
+        'src' in names,
+        'tests' in names,
+    )
+    
+    return dict(zip(_VALIDATION_COMPONENTS, checks))
+
+def _component_display_name(component: str) -> str:
+    """Turn a results key such as 'openai_api_key' into a display label"""
+    return component.replace('_', ' ').title()
+
+# Display labels for the components checked by validate_environment_setup
+_COMPONENT_DISPLAY_NAMES = {
+    component: _component_display_name(component)
+    for component in _VALIDATION_COMPONENTS
+}
 
 def format_validation_results(results: Dict[str, bool]) -> str:
     """Format validation results for display"""
-    lines = ["🔍 Environment Validation Results:"]
-    
-    for component, status in results.items():
-        status_icon = "✅" if status else "❌"
-        component_name = component.replace('_', ' ').title()
-        lines.append(f"  {status_icon} {component_name}")
-    
-    all_passed = all(results.values())
-    summary = "🎉 All checks passed!" if all_passed else "⚠️  Some checks failed"
-    lines.append(f"\n{summary}")
+    summary = "🎉 All checks passed!" if all(results.values()) else "⚠️  Some checks failed"
     
-    return "\n".join(lines)
+    return "\n".join([
+        "🔍 Environment Validation Results:",
+        *(
+            f"  {'✅' if status else '❌'} "
+            f"{_COMPONENT_DISPLAY_NAMES.get(component) or _component_display_name(component)}"
+            for component, status in results.items()
+        ),
+        f"\n{summary}"
+    ])
 
 if __name__ == "__main__":
     # Quick validation when run directly
@@ -4,9 +4,17 @@ This module assembles all components into a complete LangGraph workflow that
 orchestrates the Interactive Quiz Generator conversation flow.
 """
 
-from typing import Dict, Any, Optional, Callable
+from bisect import bisect_right
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, AsyncIterator, Hashable, Tuple, cast
 import asyncio
 import logging
+import string
+import threading
+try:
+    import uvloop
+except ImportError:  # Not installed, or unsupported platform (Windows)
+    uvloop = None
 from langgraph.graph import StateGraph, END, START
 from langchain_openai import ChatOpenAI
 
@@ -25,6 +33,105 @@ from .utils import Config
 # Configure logging
 logger = logging.getLogger(__name__)
 
+def _draw_ascii(compiled_graph: Any) -> str:
+    """Default workflow renderer: LangGraph's ASCII drawing (requires grandalf)"""
+    return str(compiled_graph.get_graph().draw_ascii())
+
+def _as_quiz_state(values: Any) -> QuizState:
+    """Wrap graph output (a dict of already-validated field values) as a QuizState"""
+    if isinstance(values, QuizState):
+        return values
+    return QuizState.model_construct(**values)
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop for synchronous entry points, using uvloop when available"""
+    if uvloop is not None:
+        return cast(asyncio.AbstractEventLoop, uvloop.new_event_loop())
+    return asyncio.new_event_loop()
+
+# Conditional edges as (source node, router, router result -> target node)
+_CONDITIONAL_EDGES: Tuple[Tuple[str, Callable[[QuizState], str], Dict[Hashable, str]], ...] = (
+    ("query_analyzer", route_after_query_analysis, {
+        "topic_validator": "topic_validator",
+        "answer_validator": "answer_validator",
+        "quiz_generator": "quiz_generator",
+        "score_generator": "score_generator",
+        "clarification_handler": "clarification_handler",
+        "session_manager": "session_manager",
+        "end": END
+    }),
+    ("topic_validator", route_after_topic_validation, {
+        "quiz_generator": "quiz_generator",
+        "clarification_handler": "clarification_handler",
+        "session_manager": "session_manager",
+        "end": END
+    }),
+    ("quiz_generator", route_after_question_generation, {
+        "query_analyzer": "query_analyzer",
+        "quiz_generator": "quiz_generator",
+        "quiz_completion_handler": "quiz_completion_handler",
+        "end": END
+    }),
+    ("answer_validator", route_after_answer_validation, {
+        "score_generator": "score_generator",
+        "clarification_handler": "clarification_handler"
+    }),
+    ("score_generator", route_after_scoring, {
+        "quiz_generator": "quiz_generator",
+        "quiz_completion_handler": "quiz_completion_handler",
+        "query_analyzer": "query_analyzer"
+    })
+)
+
+# Clarification type by (current_phase, has current question) when there is no error
+_CLARIFICATION_TYPES = MappingProxyType({
+    ("topic_selection", False): "topic_needed",
+    ("topic_selection", True): "topic_needed",
+    ("quiz_active", False): "question_generation_failed",
+    ("quiz_active", True): "answer_format_help"
+})
+
+# Clarification messages that do not depend on state
+_CLARIFICATION_MESSAGES = MappingProxyType({
+    "topic_needed": "I'd love to create a quiz for you! What topic would you like to be quizzed on? For example: 'Python programming', 'World War II history', or 'basic chemistry'.",
+    
+    "question_generation_failed": "I had trouble creating a question for that topic. Could you try a different topic or be more specific about what you'd like to learn?",
+    
+    "general_help": "I'm here to help! You can:\n- Start a quiz by telling me a topic\n- Answer the current question if we're in a quiz\n- Say 'new quiz' to start over\n- Say 'exit' to end our conversation"
+})
+
+# Labels for multiple choice options, in display order
+_OPTION_LETTERS = string.ascii_uppercase
+
+# Completion summary levels; accuracy at or above a threshold moves up one level
+_PERFORMANCE_THRESHOLDS = (60, 70, 80, 90)
+_PERFORMANCE_LEVELS = (
+    ("Keep practicing", "💪"),
+    ("Fair", "📈"),
+    ("Good", "👍"),
+    ("Great", "👏"),
+    ("Excellent", "🎉")
+)
+
+# Clarification messages filled in from the current state
+_ANSWER_FORMAT_HELP_TEMPLATE = "I'm waiting for your answer to: '{question}'\n\nYou can answer in your own words, or if it's multiple choice, just say the letter (A, B, C, or D)."
+_ERROR_RECOVERY_TEMPLATE = "I encountered an issue: {error}\n\nLet's try again! You can:\n- Continue with the current quiz\n- Start a new quiz with 'new quiz'\n- Exit with 'exit'"
+_COMPLETION_SUMMARY_TEMPLATE = """{emoji} **Quiz Complete!**
+
+**{performance_level} work on {topic}!**
+
+📊 **Final Results:**
+- Questions answered: {total_questions_answered}
+- Correct answers: {correct_answers_count}
+- Accuracy: {accuracy:.1f}%
+- Total score: {total_score} points
+
+Would you like to:
+- Try a **new quiz** on a different topic?
+- **Exit** and come back later?
+
+Just let me know what you'd prefer!"""
+
 class QuizWorkflow:
     """
     Main workflow orchestrator for the Interactive Quiz Generator.
@@ -33,15 +140,21 @@ class QuizWorkflow:
     that manages the entire quiz conversation flow.
     """
     
+    # Nodes that receive the workflow's LLM client
+    LLM_NODES = frozenset({"query_analyzer", "topic_validator", "quiz_generator", "answer_validator"})
+    
     def __init__(self):
         """Initialize the quiz workflow"""
         try:
             self.llm = self._create_llm_client()
             self.workflow_graph = None
             self.compiled_graph = None
+            self._loop: Optional[asyncio.AbstractEventLoop] = None
+            self._loop_thread: Optional[threading.Thread] = None
+            self._loop_lock = threading.Lock()
             self._build_workflow()
         except Exception as e:
-            logger.error(f"Failed to initialize workflow: {str(e)}")
+            logger.error("Failed to initialize workflow: %s", e)
             raise WorkflowBuildError(f"Workflow initialization failed: {str(e)}")
     
     def _create_llm_client(self) -> ChatOpenAI:
@@ -74,10 +187,13 @@ class QuizWorkflow:
             self.workflow_graph = workflow
             self.compiled_graph = workflow.compile()
             
+            # The graph is fixed once compiled, so describe it once
+            self._workflow_info = self._collect_workflow_info()
+            
             logger.info("LangGraph workflow built successfully")
             
         except Exception as e:
-            logger.error(f"Failed to build workflow: {str(e)}")
+            logger.error("Failed to build workflow: %s", e)
             raise WorkflowBuildError(f"Workflow construction failed: {str(e)}")
     
     def _add_nodes(self, workflow: StateGraph) -> None:
@@ -100,65 +216,9 @@ class QuizWorkflow:
     def _add_edges(self, workflow: StateGraph) -> None:
         """Add all edges and routing logic to the workflow"""
         
-        # Main conditional edge from query analyzer
-        workflow.add_conditional_edges(
-            "query_analyzer",
-            route_after_query_analysis,
-            {
-                "topic_validator": "topic_validator",
-                "answer_validator": "answer_validator", 
-                "quiz_generator": "quiz_generator",
-                "score_generator": "score_generator",
-                "clarification_handler": "clarification_handler",
-                "session_manager": "session_manager",
-                "end": END
-            }
-        )
-        
-        # Topic validator conditional edges
-        workflow.add_conditional_edges(
-            "topic_validator",
-            route_after_topic_validation,
-            {
-                "quiz_generator": "quiz_generator",
-                "clarification_handler": "clarification_handler",
-                "session_manager": "session_manager",
-                "end": END
-            }
-        )
-        
-        # Quiz generator conditional edges
-        workflow.add_conditional_edges(
-            "quiz_generator",
-            route_after_question_generation,
-            {
-                "query_analyzer": "query_analyzer",
-                "quiz_generator": "quiz_generator", 
-                "quiz_completion_handler": "quiz_completion_handler",
-                "end": END
-            }
-        )
-        
-        # Answer validator conditional edges
-        workflow.add_conditional_edges(
-            "answer_validator",
-            route_after_answer_validation,
-            {
-                "score_generator": "score_generator",
-                "clarification_handler": "clarification_handler"
-            }
-        )
-        
-        # Score generator conditional edges
-        workflow.add_conditional_edges(
-            "score_generator", 
-            route_after_scoring,
-            {
-                "quiz_generator": "quiz_generator",
-                "quiz_completion_handler": "quiz_completion_handler",
-                "query_analyzer": "query_analyzer"
-            }
-        )
+        # Conditional edges; LangGraph copies each path map once at build time
+        for source, router, path_map in _CONDITIONAL_EDGES:
+            workflow.add_conditional_edges(source, router, path_map)
         
         # Helper node edges - all return to query analyzer
         workflow.add_edge("clarification_handler", "query_analyzer")
@@ -169,22 +229,31 @@ class QuizWorkflow:
     
     def _wrap_node(self, node_func: Callable) -> Callable:
         """Wrap node function with LLM client injection and error handling"""
+        node_name = node_func.__name__
         
-        def wrapped_node(state: QuizState) -> QuizState:
-            try:
-                # Inject LLM client for nodes that need it
-                if node_func.__name__ in ['query_analyzer', 'topic_validator', 'quiz_generator', 'answer_validator']:
+        # Decide LLM injection once at build time rather than on every call
+        if node_name in self.LLM_NODES:
+            def wrapped_node(state: QuizState) -> QuizState:
+                try:
                     return node_func(state, self.llm)
-                else:
+                except Exception as e:
+                    return self._handle_node_error(node_name, state, e)
+        else:
+            def wrapped_node(state: QuizState) -> QuizState:
+                try:
                     return node_func(state)
-            except Exception as e:
-                logger.error(f"Node {node_func.__name__} failed: {str(e)}")
-                state.last_error = f"System error in {node_func.__name__}: {str(e)}"
-                state.retry_count += 1
-                return state
+                except Exception as e:
+                    return self._handle_node_error(node_name, state, e)
         
         return wrapped_node
     
+    def _handle_node_error(self, node_name: str, state: QuizState, error: Exception) -> QuizState:
+        """Record a node failure on the state so routing can recover"""
+        logger.error("Node %s failed: %s", node_name, error)
+        state.last_error = f"System error in {node_name}: {str(error)}"
+        state.retry_count += 1
+        return state
+    
     # === HELPER NODES ===
     
     def _clarification_handler(self, state: QuizState) -> QuizState:
@@ -198,20 +267,17 @@ class QuizWorkflow:
             # Generate appropriate clarification message
             clarification_message = self._generate_clarification_message(state, clarification_type)
             
-            # Update conversation history
-            state.add_conversation_entry(
-                user_input=state.user_input,
-                system_response=clarification_message
+            # Update conversation history and reset for fresh input
+            state.apply_update(
+                conversation_entry=(state.user_input, clarification_message),
+                user_input="",
+                last_error=None
             )
             
-            # Reset for fresh input
-            state.user_input = ""
-            state.last_error = None
-            
             return state
             
         except Exception as e:
-            logger.error(f"Clarification handler error: {str(e)}")
+            logger.error("Clarification handler error: %s", e)
             state.last_error = "I'm having trouble helping you. Please try again."
             return state
     
@@ -223,19 +289,16 @@ class QuizWorkflow:
             # Generate completion summary
             summary = self._generate_completion_summary(state)
             
-            # Update conversation history
-            state.add_conversation_entry(
-                user_input="Quiz completed",
-                system_response=summary
+            # Update conversation history, then phase
+            state.apply_update(
+                conversation_entry=("Quiz completed", summary),
+                current_phase="quiz_complete"
             )
             
-            # Update phase
-            state.current_phase = "quiz_complete"
-            
             return state
             
         except Exception as e:
-            logger.error(f"Quiz completion handler error: {str(e)}")
+            logger.error("Quiz completion handler error: %s", e)
             state.last_error = "Error generating quiz summary"
             return state
     
@@ -262,7 +325,7 @@ class QuizWorkflow:
             return state
             
         except Exception as e:
-            logger.error(f"Session manager error: {str(e)}")
+            logger.error("Session manager error: %s", e)
             state.last_error = "Error managing session"
             return state
     
@@ -273,71 +336,38 @@ class QuizWorkflow:
         # Check for errors first since they take priority
         if state.last_error:
             return "error_recovery"
-        elif state.current_phase == "topic_selection":
-            return "topic_needed"
-        elif state.current_phase == "quiz_active" and not state.current_question:
-            return "question_generation_failed" 
-        elif state.current_phase == "quiz_active" and state.current_question:
-            return "answer_format_help"
-        else:
-            return "general_help"
+        
+        return _CLARIFICATION_TYPES.get(
+            (state.current_phase, bool(state.current_question)), "general_help"
+        )
     
     def _generate_clarification_message(self, state: QuizState, clarification_type: str) -> str:
         """Generate appropriate clarification message"""
+        if clarification_type == "answer_format_help":
+            return _ANSWER_FORMAT_HELP_TEMPLATE.format(question=state.current_question)
+        if clarification_type == "error_recovery":
+            return _ERROR_RECOVERY_TEMPLATE.format(error=state.last_error)
         
-        messages = {
-            "topic_needed": "I'd love to create a quiz for you! What topic would you like to be quizzed on? For example: 'Python programming', 'World War II history', or 'basic chemistry'.",
-            
-            "question_generation_failed": "I had trouble creating a question for that topic. Could you try a different topic or be more specific about what you'd like to learn?",
-            
-            "answer_format_help": f"I'm waiting for your answer to: '{state.current_question}'\n\nYou can answer in your own words, or if it's multiple choice, just say the letter (A, B, C, or D).",
-            
-            "error_recovery": f"I encountered an issue: {state.last_error}\n\nLet's try again! You can:\n- Continue with the current quiz\n- Start a new quiz with 'new quiz'\n- Exit with 'exit'",
-            
-            "general_help": "I'm here to help! You can:\n- Start a quiz by telling me a topic\n- Answer the current question if we're in a quiz\n- Say 'new quiz' to start over\n- Say 'exit' to end our conversation"
-        }
-        
-        return messages.get(clarification_type, messages["general_help"])
+        return _CLARIFICATION_MESSAGES.get(clarification_type, _CLARIFICATION_MESSAGES["general_help"])
     
     def _generate_completion_summary(self, state: QuizState) -> str:
         """Generate quiz completion summary"""
-        performance = state.get_performance_summary()
-        accuracy = performance['accuracy']
+        accuracy = state.calculate_accuracy()
         
         # Determine performance level
-        if accuracy >= 90:
-            performance_level = "Excellent"
-            emoji = "🎉"
-        elif accuracy >= 80:
-            performance_level = "Great"
-            emoji = "👏"
-        elif accuracy >= 70:
-            performance_level = "Good"
-            emoji = "👍"
-        elif accuracy >= 60:
-            performance_level = "Fair"
-            emoji = "📈"
-        else:
-            performance_level = "Keep practicing"
-            emoji = "💪"
-        
-        summary = f"""{emoji} **Quiz Complete!**
-
-**{performance_level} work on {state.topic}!**
-
-📊 **Final Results:**
-- Questions answered: {state.total_questions_answered}
-- Correct answers: {state.correct_answers_count}
-- Accuracy: {accuracy:.1f}%
-- Total score: {state.total_score} points
-
-Would you like to:
-- Try a **new quiz** on a different topic?
-- **Exit** and come back later?
-
-Just let me know what you'd prefer!"""
-        
-        return summary
+        performance_level, emoji = _PERFORMANCE_LEVELS[
+            bisect_right(_PERFORMANCE_THRESHOLDS, accuracy)
+        ]
+        
+        return _COMPLETION_SUMMARY_TEMPLATE.format(
+            emoji=emoji,
+            performance_level=performance_level,
+            topic=state.topic,
+            total_questions_answered=state.total_questions_answered,
+            correct_answers_count=state.correct_answers_count,
+            accuracy=accuracy,
+            total_score=state.total_score
+        )
     
     # === WORKFLOW EXECUTION ===
     
@@ -352,39 +382,113 @@ Just let me know what you'd prefer!"""
         Returns:
             Updated quiz state after processing
         """
-        logger.info(f"Processing user input: '{user_input}'")
+        logger.info("Processing user input: '%s'", user_input)
+        
+        # Create or update state
+        state = current_state if current_state is not None else create_initial_state()
         
         try:
-            # Create or update state
-            if current_state is None:
-                state = create_initial_state()
-            else:
-                state = current_state
-            
-            # Set user input
+            # Set user input (str.strip returns the same object when there is nothing to trim)
             state.user_input = user_input.strip()
             
             # Execute workflow
-            result = await self.compiled_graph.ainvoke(state)
+            result = _as_quiz_state(await self.compiled_graph.ainvoke(state))
             
-            logger.info(f"Workflow completed, final phase: {result.current_phase}")
+            logger.info("Workflow completed, final phase: %s", result.current_phase)
             return result
             
         except Exception as e:
-            logger.error(f"Workflow execution error: {str(e)}")
+            logger.error("Workflow execution error: %s", e)
             
-            # Create error state
-            if current_state:
-                current_state.last_error = f"System error: {str(e)}"
-                return current_state
-            else:
-                error_state = create_initial_state()
-                error_state.last_error = f"System error: {str(e)}"
-                return error_state
+            # Report the error on the state already in hand rather than allocating another
+            state.last_error = f"System error: {str(e)}"
+            return state
+    
+    async def stream_responses(
+        self, user_input: str, current_state: Optional[QuizState] = None
+    ) -> AsyncIterator[Tuple[QuizState, str]]:
+        """
+        Process user input and yield a response as soon as each node finishes.
+        
+        Args:
+            user_input: User's input text
+            current_state: Current quiz state (creates new if None)
+            
+        Yields:
+            (state, response) pairs whenever the rendered response changes;
+            the last state yielded is the final state for the turn
+        """
+        logger.info("Streaming user input: '%s'", user_input)
+        
+        state = current_state if current_state is not None else create_initial_state()
+        state.user_input = user_input.strip()
+        last_response = None
+        yielded_state: Optional[QuizState] = None
+        
+        try:
+            if self.compiled_graph is None:
+                raise WorkflowExecutionError("Workflow graph is not compiled")
+            
+            # The first "values" chunk is the input state itself, so skip it
+            first = True
+            async for values in self.compiled_graph.astream(state, stream_mode="values"):
+                if first:
+                    first = False
+                    continue
+                state = _as_quiz_state(values)
+                response = self.get_response_for_state(state)
+                if response != last_response:
+                    last_response = response
+                    yielded_state = state
+                    yield state, response
+            
+            # Later steps may change the state without changing the response
+            # (or no step ran); the caller must still receive the final state
+            if state is not yielded_state and state != yielded_state:
+                yield state, self.get_response_for_state(state)
+            
+            logger.info("Workflow stream completed, final phase: %s", state.current_phase)
+            
+        except Exception as e:
+            logger.error("Workflow streaming error: %s", e)
+            state.last_error = f"System error: {str(e)}"
+            yield state, self.get_response_for_state(state)
     
     def process_input_sync(self, user_input: str, current_state: Optional[QuizState] = None) -> QuizState:
         """Synchronous wrapper for process_input"""
-        return asyncio.run(self.process_input(user_input, current_state))
+        future = asyncio.run_coroutine_threadsafe(
+            self.process_input(user_input, current_state),
+            self._get_background_loop()
+        )
+        return future.result()
+    
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Start (once) the event loop that serves synchronous callers"""
+        # A persistent loop keeps the LLM client's connections alive between
+        # turns instead of creating and closing a loop per message
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = _new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="quiz-workflow-loop",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+    
+    def close(self) -> None:
+        """Stop and close the event loop started for synchronous callers, if any"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
     
     def get_response_for_state(self, state: QuizState) -> str:
         """Generate appropriate response text based on current state"""
@@ -406,10 +510,10 @@ Just let me know what you'd prefer!"""
         elif state.current_phase == "quiz_active":
             if state.current_question:
                 if state.question_type == "multiple_choice" and state.question_options:
-                    options = "\n".join([
-                        f"{chr(65+i)}) {opt}" 
-                        for i, opt in enumerate(state.question_options)
-                    ])
+                    options = "\n".join(
+                        f"{letter}) {opt}"
+                        for letter, opt in zip(_OPTION_LETTERS, state.question_options)
+                    )
                     return f"**Question {state.current_question_index + 1}:** {state.current_question}\n\n{options}"
                 else:
                     return f"**Question {state.current_question_index + 1}:** {state.current_question}"
@@ -438,6 +542,10 @@ Just let me know what you'd prefer!"""
         if not self.compiled_graph:
             return {"error": "Workflow not compiled"}
         
+        return dict(self._workflow_info)
+    
+    def _collect_workflow_info(self) -> Dict[str, Any]:
+        """Describe the compiled graph (computed once in _build_workflow)"""
         try:
             graph = self.compiled_graph.get_graph()
             # Get nodes directly from the graph
@@ -452,10 +560,18 @@ Just let me know what you'd prefer!"""
         except Exception as e:
             return {"error": f"Failed to get workflow info: {str(e)}"}
     
-    def visualize_workflow(self) -> str:
-        """Generate a text representation of the workflow"""
+    def visualize_workflow(self, renderer: Callable[[Any], str] = _draw_ascii) -> str:
+        """
+        Generate a text representation of the workflow.
+        
+        Args:
+            renderer: Turns the compiled graph into text (ASCII drawing by default)
+            
+        Returns:
+            Rendered workflow, or the failure reason if rendering raised
+        """
         try:
-            return self.compiled_graph.get_graph().draw_ascii()
+            return renderer(self.compiled_graph)
         except Exception as e:
             return f"Visualization failed: {str(e)}"
 
@@ -482,14 +598,15 @@ def create_quiz_workflow() -> QuizWorkflow:
         logger.info("Quiz workflow created successfully")
         return workflow
     except Exception as e:
-        logger.error(f"Failed to create quiz workflow: {str(e)}")
+        logger.error("Failed to create quiz workflow: %s", e)
         raise WorkflowBuildError(f"Workflow creation failed: {str(e)}")
 
 # === TESTING UTILITIES ===
 
-async def test_workflow_execution():
-    """Test complete workflow execution"""
-    workflow = create_quiz_workflow()
+async def test_workflow_execution(workflow: Optional[QuizWorkflow] = None):
+    """Test complete workflow execution (builds a workflow if none is given)"""
+    if workflow is None:
+        workflow = create_quiz_workflow()
     
     # Test conversation flow
     test_inputs = [
@@ -501,27 +618,33 @@ async def test_workflow_execution():
     
     state = None
     for user_input in test_inputs:
-        logger.info(f"Testing input: '{user_input}'")
+        logger.info("Testing input: '%s'", user_input)
         state = await workflow.process_input(user_input, state)
         response = workflow.get_response_for_state(state)
-        logger.info(f"Response: {response[:100]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Response: %s...", response[:100])
     
     return state
 
-def test_workflow_sync():
+def test_workflow_sync(workflow: Optional[QuizWorkflow] = None):
     """Synchronous test of workflow"""
-    return asyncio.run(test_workflow_execution())
+    loop = _new_event_loop()
+    try:
+        return loop.run_until_complete(test_workflow_execution(workflow))
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
 
 if __name__ == "__main__":
     # Test workflow
     print("Testing Quiz Workflow...")
     
     try:
-        final_state = test_workflow_sync()
+        workflow = create_quiz_workflow()
+        final_state = test_workflow_sync(workflow)
         print(f"Test completed. Final phase: {final_state.current_phase}")
         
         # Print workflow info
-        workflow = create_quiz_workflow()
         info = workflow.get_workflow_info()
         print(f"Workflow info: {info}")
         
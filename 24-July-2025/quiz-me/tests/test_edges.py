@@ -1,7 +1,6 @@
 """Tests for edge logic and routing functionality"""
 
 import pytest
-from unittest.mock import Mock, patch
 
 from src.edges import (
     route_conversation, route_from_topic_selection, route_from_topic_validation,
@@ -14,8 +13,56 @@ from src.edges import (
     route_after_question_generation, route_after_answer_validation,
     route_after_scoring
 )
+from src.edges.query_analyzer_router import resolve_ambiguous_intent
+from src.edges.topic_validator_router import suggest_alternative_topics
+from src.edges.quiz_generator_router import handle_topic_exhausted
+from src.edges.answer_validator_router import perform_simple_validation
+from src.edges.score_generator_router import handle_performance_based_routing
+from src.edges.conversation_router import (
+    handle_mid_quiz_topic_change, handle_ambiguous_answer_intent,
+    handle_infinite_quiz_termination, route_error_recovery,
+    log_routing_decision, validate_routing_result
+)
+import src.edges.conversation_router as conversation_router
 from src.state import QuizState, create_test_state
 
+# State at each step of a complete quiz flow; each step builds on the previous one
+_FLOW_TOPIC_SELECTION = {
+    "current_phase": "topic_selection",
+    "user_intent": "start_quiz",
+    "user_input": "Python programming"
+}
+_FLOW_TOPIC_VALIDATED = {
+    **_FLOW_TOPIC_SELECTION,
+    "current_phase": "topic_validation",
+    "topic_validated": True,
+    "topic": "Python Programming"
+}
+_FLOW_ANSWER_SUBMITTED = {
+    **_FLOW_TOPIC_VALIDATED,
+    "current_phase": "quiz_active",
+    "user_intent": "answer_question",
+    "current_question": "What is a list?"
+}
+
+@pytest.fixture
+def python_topic_state():
+    """Test state in topic selection with a topic request as user input"""
+    # Routing validation requires user input before topic validation
+    return create_test_state(phase="topic_selection", user_input="Python programming")
+
+@pytest.fixture
+def isolated_metrics(monkeypatch):
+    """Fresh global routing metrics for one test, so recorded routes don't leak"""
+    metrics = RoutingMetrics()
+    monkeypatch.setattr(conversation_router, "routing_metrics", metrics)
+    return metrics
+
+@pytest.fixture(scope="session")
+def routing_scenarios():
+    """Routing scenario results, computed once per test session"""
+    return routing_scenarios_util()  # Use the renamed import
+
 class TestMainRouting:
     """Test main routing function"""
     
@@ -45,12 +92,10 @@ class TestMainRouting:
         result = route_conversation(state)
         assert result == "query_analyzer"
     
-    def test_main_route_conversation_with_decorators(self):
+    def test_main_route_conversation_with_decorators(self, python_topic_state):
         """Test main routing function with decorators"""
-        state = create_test_state()
-        state.current_phase = "topic_selection"
+        state = python_topic_state
         state.user_intent = "start_quiz"
-        state.user_input = "Python programming"  # Add user input for validation
         
         result = main_route_conversation(state)
         assert result == "topic_validator"
@@ -58,25 +103,19 @@ class TestMainRouting:
 class TestPhaseSpecificRouting:
     """Test phase-specific routing functions"""
     
-    def test_route_from_topic_selection(self):
+    @pytest.mark.parametrize("intent,expected", [
+        ("start_quiz", "topic_validator"),
+        ("clarification", "clarification_handler"),
+        ("unknown", "clarification_handler")
+    ])
+    def test_route_from_topic_selection(self, intent, expected):
         """Test routing from topic selection phase"""
         state = create_test_state()
         state.current_phase = "topic_selection"
+        state.user_intent = intent
         
-        # Test start quiz intent
-        state.user_intent = "start_quiz"
-        result = route_from_topic_selection(state)
-        assert result == "topic_validator"
-        
-        # Test clarification intent
-        state.user_intent = "clarification"
         result = route_from_topic_selection(state)
-        assert result == "clarification_handler"
-        
-        # Test unknown intent
-        state.user_intent = "unknown"
-        result = route_from_topic_selection(state)
-        assert result == "clarification_handler"
+        assert result == expected
     
     def test_route_from_topic_validation(self):
         """Test routing from topic validation phase"""
@@ -99,136 +138,116 @@ class TestPhaseSpecificRouting:
         result = route_from_topic_validation(state)
         assert result == "end"
     
-    def test_route_from_quiz_active(self):
+    @pytest.mark.parametrize("intent,expected", [
+        ("answer_question", "answer_validator"),
+        ("clarification", "clarification_handler")
+    ])
+    def test_route_from_quiz_active(self, intent, expected):
         """Test routing from quiz active phase"""
         state = create_test_state()
         state.current_phase = "quiz_active"
+        state.user_intent = intent
         
-        # Test answer intent
-        state.user_intent = "answer_question"
         result = route_from_quiz_active(state)
-        assert result == "answer_validator"
-        
-        # Test clarification intent
-        state.user_intent = "clarification"
-        result = route_from_quiz_active(state)
-        assert result == "clarification_handler"
-        
-        # Test ambiguous intent with current question
+        assert result == expected
+    
+    def test_route_from_quiz_active_ambiguous_intent(self):
+        """Test ambiguous intent with a current question is treated as an answer"""
+        state = create_test_state()
+        state.current_phase = "quiz_active"
         state.user_intent = "unclear"
         state.current_question = "What is 2+2?"
         state.user_input = "4"
+        
         result = route_from_quiz_active(state)
         assert result == "answer_validator"
         assert state.user_intent == "answer_question"  # Should be overridden
     
-    def test_route_from_question_answered(self):
+    @pytest.mark.parametrize("intent", ["continue", "unknown"])
+    def test_route_from_question_answered(self, intent):
         """Test routing from question answered phase"""
         state = create_test_state()
         state.current_phase = "question_answered"
+        state.user_intent = intent
         
-        # Test continue intent
-        state.user_intent = "continue"
-        result = route_from_question_answered(state)
-        assert result == "score_generator"
-        
-        # Test default routing
-        state.user_intent = "unknown"
         result = route_from_question_answered(state)
         assert result == "score_generator"
     
-    def test_route_from_quiz_complete(self):
+    @pytest.mark.parametrize("intent,expected", [
+        ("new_quiz", "topic_validator"),
+        ("unknown", "end")
+    ])
+    def test_route_from_quiz_complete(self, intent, expected):
         """Test routing from quiz complete phase"""
         state = create_test_state()
         state.current_phase = "quiz_complete"
+        state.user_intent = intent
         
-        # Test new quiz intent
-        state.user_intent = "new_quiz"
-        result = route_from_quiz_complete(state)
-        assert result == "topic_validator"
-        
-        # Test other intents
-        state.user_intent = "unknown"
         result = route_from_quiz_complete(state)
-        assert result == "end"
+        assert result == expected
 
 class TestRoutingConditions:
     """Test routing condition functions"""
     
-    def test_should_end_session(self):
+    @pytest.mark.parametrize("fields,expected", [
+        ({"user_intent": "exit"}, True),
+        ({"user_intent": "continue", "retry_count": 5}, True),
+        ({"current_phase": "quiz_complete", "user_intent": "goodbye"}, True),
+        ({"current_phase": "quiz_active", "user_intent": "continue"}, False)
+    ], ids=["exit_intent", "too_many_retries", "quiz_complete", "normal_continuation"])
+    def test_should_end_session(self, fields, expected):
         """Test session ending conditions"""
         state = QuizState()
+        state.apply_update(**fields)
         
-        # Test exit intent
-        state.user_intent = "exit"
-        assert should_end_session(state) is True
-        
-        # Test too many retries
-        state.user_intent = "continue"
-        state.retry_count = 5
-        assert should_end_session(state) is True
-        
-        # Test quiz complete without new quiz intent
-        state.retry_count = 0
-        state.current_phase = "quiz_complete"
-        state.user_intent = "goodbye"
-        assert should_end_session(state) is True
-        
-        # Test normal continuation
-        state.current_phase = "quiz_active"
-        state.user_intent = "continue"
-        assert should_end_session(state) is False
+        assert should_end_session(state) is expected
     
-    def test_should_start_new_quiz(self):
+    @pytest.mark.parametrize("intent,expected", [
+        ("new_quiz", True),
+        ("start_quiz", True),
+        ("continue", False)
+    ])
+    def test_should_start_new_quiz(self, intent, expected):
         """Test new quiz starting conditions"""
         state = QuizState()
+        state.user_intent = intent
         
-        state.user_intent = "new_quiz"
-        assert should_start_new_quiz(state) is True
-        
-        state.user_intent = "start_quiz"
-        assert should_start_new_quiz(state) is True
-        
-        state.user_intent = "continue"
-        assert should_start_new_quiz(state) is False
+        assert should_start_new_quiz(state) is expected
     
-    def test_should_continue_quiz(self):
+    @pytest.mark.parametrize("quiz_active,quiz_completed,expected", [
+        (True, False, True),
+        (True, True, False),
+        (False, False, False)
+    ], ids=["active", "completed", "not_active"])
+    def test_should_continue_quiz(self, quiz_active, quiz_completed, expected):
         """Test quiz continuation conditions"""
         state = create_test_state()
-        state.quiz_active = True
-        state.quiz_completed = False
+        state.quiz_active = quiz_active
+        state.quiz_completed = quiz_completed
         state.user_intent = "continue"
         
-        assert should_continue_quiz(state) is True
-        
-        # Test with quiz completed
-        state.quiz_completed = True
-        assert should_continue_quiz(state) is False
-        
-        # Test with quiz not active
-        state.quiz_completed = False
-        state.quiz_active = False
-        assert should_continue_quiz(state) is False
+        assert should_continue_quiz(state) is expected
 
 class TestErrorHandling:
     """Test error handling and classification"""
     
-    def test_classify_error_type(self):
+    @pytest.mark.parametrize("error_message,expected", [
+        ("User input unclear", "user_input_error"),
+        ("LLM API timeout", "llm_error"),
+        ("Validation failed", "validation_error"),
+        ("Unknown error", "unknown"),
+        (None, "unknown")
+    ])
+    def test_classify_error_type(self, error_message, expected):
         """Test error type classification"""
-        assert classify_error_type("User input unclear") == "user_input_error"
-        assert classify_error_type("LLM API timeout") == "llm_error"
-        assert classify_error_type("Validation failed") == "validation_error"
-        assert classify_error_type("Unknown error") == "unknown"
-        assert classify_error_type(None) == "unknown"
+        assert classify_error_type(error_message) == expected
 
 class TestRoutingValidation:
     """Test routing validation"""
     
-    def test_validate_routing_decision(self):
+    def test_validate_routing_decision(self, python_topic_state):
         """Test routing decision validation"""
-        state = create_test_state()
-        state.current_phase = "topic_selection"
-        state.user_input = "Python programming"  # Add user input for validation
+        state = python_topic_state
         
         # Valid transition
         assert validate_routing_decision(state, "topic_validator") is True
@@ -276,8 +295,6 @@ class TestQueryAnalyzerRouting:
     
     def test_resolve_ambiguous_intent(self):
         """Test ambiguous intent resolution"""
-        from src.edges.query_analyzer_router import resolve_ambiguous_intent
-        
         state = create_test_state()
         state.current_phase = "quiz_active"
         state.current_question = "What is 2+2?"
@@ -311,8 +328,6 @@ class TestTopicValidatorRouting:
     
     def test_suggest_alternative_topics(self):
         """Test alternative topic suggestions"""
-        from src.edges.topic_validator_router import suggest_alternative_topics
-        
         state = create_test_state()
         state.user_input = "I want to learn about python programming"
         
@@ -345,8 +360,6 @@ class TestQuizGeneratorRouting:
     
     def test_handle_topic_exhausted(self):
         """Test topic exhausted handling"""
-        from src.edges.quiz_generator_router import handle_topic_exhausted
-        
         state = create_test_state()
         state.total_questions_answered = 5  # Sufficient questions
         
@@ -378,8 +391,6 @@ class TestAnswerValidatorRouting:
     
     def test_fallback_validation(self):
         """Test fallback validation methods"""
-        from src.edges.answer_validator_router import perform_simple_validation
-        
         state = create_test_state()
         state.current_answer = "a"
         state.correct_answer = "0"
@@ -414,8 +425,6 @@ class TestScoreGeneratorRouting:
     
     def test_performance_based_routing(self):
         """Test performance-based routing decisions"""
-        from src.edges.score_generator_router import handle_performance_based_routing
-        
         # Test struggling user
         state = create_test_state()
         state.total_questions_answered = 5
@@ -445,13 +454,14 @@ class TestRoutingMetrics:
         assert stats["total_routes"] == 2
         assert ("topic_selection->topic_validator", 2) in stats["most_common_routes"]
         assert stats["error_routes"]["llm_error"] == 1
+        assert stats["phase_transitions"] == {"topic_selection": {"topic_validator": 2}}
 
 class TestRoutingScenarios:
     """Test complete routing scenarios"""
     
-    def test_routing_scenarios(self):
+    def test_routing_scenarios(self, routing_scenarios):
         """Test predefined routing scenarios"""
-        scenarios = routing_scenarios_util()  # Use the renamed import
+        scenarios = routing_scenarios
         
         assert "topic_selection_start" in scenarios
         assert "quiz_active_answer" in scenarios
@@ -463,12 +473,10 @@ class TestRoutingScenarios:
         assert scenarios["quiz_active_answer"] == "answer_validator"
         assert scenarios["any_phase_exit"] == "end"
     
-    def test_conversation_flow_simulation(self):
+    def test_conversation_flow_simulation(self, python_topic_state):
         """Test conversation flow simulation"""
-        state = create_test_state()
-        state.current_phase = "topic_selection"  # Start from topic selection
+        state = python_topic_state
         state.user_intent = "start_quiz"
-        state.user_input = "Python programming"  # Add user input
         state.quiz_active = False  # Not in active quiz yet
         
         flow = simulate_conversation_flow(state, max_steps=5)
@@ -476,38 +484,25 @@ class TestRoutingScenarios:
         assert len(flow) > 0
         assert flow[0] == "topic_validator"  # First step should be topic validation
     
-    def test_complete_quiz_flow(self):
-        """Test complete quiz flow simulation"""
-        state = QuizState()
-        state.current_phase = "topic_selection"
-        state.user_intent = "start_quiz"
-        state.user_input = "Python programming"
-        
-        # Simulate successful topic validation
-        flow_step1 = route_conversation(state)
-        assert flow_step1 == "topic_validator"
-        
-        # Simulate successful quiz generation
-        state.current_phase = "topic_validation"
-        state.topic_validated = True
-        state.topic = "Python Programming"
-        flow_step2 = route_conversation(state)
-        assert flow_step2 == "quiz_generator"
-        
-        # Simulate answer submission
-        state.current_phase = "quiz_active"
-        state.user_intent = "answer_question"
-        state.current_question = "What is a list?"
-        flow_step3 = route_conversation(state)
-        assert flow_step3 == "answer_validator"
+    @pytest.mark.parametrize("fields,expected", [
+        # Topic request
+        (_FLOW_TOPIC_SELECTION, "topic_validator"),
+        # Successful topic validation
+        (_FLOW_TOPIC_VALIDATED, "quiz_generator"),
+        # Answer submission
+        (_FLOW_ANSWER_SUBMITTED, "answer_validator")
+    ])
+    def test_complete_quiz_flow(self, fields, expected):
+        """Test each step of a complete quiz flow"""
+        state = QuizState(**fields)
+        
+        assert route_conversation(state) == expected
 
 class TestComplexScenarios:
     """Test complex routing scenarios"""
     
     def test_mid_quiz_topic_change(self):
         """Test handling topic change during quiz"""
-        from src.edges.conversation_router import handle_mid_quiz_topic_change
-        
         state = create_test_state()
         state.quiz_active = True
         state.total_questions_answered = 3
@@ -520,8 +515,6 @@ class TestComplexScenarios:
     
     def test_ambiguous_answer_intent(self):
         """Test handling ambiguous answer intent"""
-        from src.edges.conversation_router import handle_ambiguous_answer_intent
-        
         state = create_test_state()
         state.current_phase = "quiz_active"
         state.current_question = "What is 2+2?"
@@ -533,8 +526,6 @@ class TestComplexScenarios:
     
     def test_infinite_quiz_termination(self):
         """Test infinite quiz termination logic"""
-        from src.edges.conversation_router import handle_infinite_quiz_termination
-        
         state = create_test_state()
         state.quiz_type = "infinite"
         state.total_questions_answered = 50  # Hit limit
@@ -546,35 +537,28 @@ class TestComplexScenarios:
 class TestErrorRecovery:
     """Test error recovery routing"""
     
-    def test_error_recovery_routing(self):
+    @pytest.mark.parametrize("last_error,retry_count,expected", [
+        # User input error
+        ("User input unclear", 0, {"clarification_handler"}),
+        # LLM error with retries available
+        ("LLM API timeout", 1, {"query_analyzer", "topic_validator", "quiz_generator", "answer_validator"}),
+        # LLM error with max retries
+        ("LLM API timeout", 3, {"end"})
+    ])
+    def test_error_recovery_routing(self, last_error, retry_count, expected):
         """Test error recovery based on error type"""
-        from src.edges.conversation_router import route_error_recovery
-        
         state = create_test_state()
+        state.last_error = last_error
+        state.retry_count = retry_count
         
-        # Test user input error
-        state.last_error = "User input unclear"
-        result = route_error_recovery(state)
-        assert result == "clarification_handler"
-        
-        # Test LLM error with retries available
-        state.last_error = "LLM API timeout"
-        state.retry_count = 1
         result = route_error_recovery(state)
-        assert result in ["query_analyzer", "topic_validator", "quiz_generator", "answer_validator"]
-        
-        # Test LLM error with max retries
-        state.retry_count = 3
-        result = route_error_recovery(state)
-        assert result == "end"
+        assert result in expected
 
 class TestRoutingDecorators:
     """Test routing decorators"""
     
-    def test_log_routing_decision(self):
+    def test_log_routing_decision(self, isolated_metrics):
         """Test routing decision logging"""
-        from src.edges.conversation_router import log_routing_decision, routing_metrics
-        
         @log_routing_decision
         def test_route(state):
             return "test_node"
@@ -587,13 +571,12 @@ class TestRoutingDecorators:
         assert result == "test_node"
         
         # Check that metrics were recorded
-        stats = routing_metrics.get_routing_stats()
-        assert stats["total_routes"] > 0
+        stats = isolated_metrics.get_routing_stats()
+        assert stats["total_routes"] == 1
+        assert stats["most_common_routes"] == [("test_phase->test_node", 1)]
     
     def test_validate_routing_result(self):
         """Test routing result validation"""
-        from src.edges.conversation_router import validate_routing_result
-        
         @validate_routing_result
         def invalid_route(state):
             return "invalid_node"
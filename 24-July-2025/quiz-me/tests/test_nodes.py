@@ -1,11 +1,11 @@
 """Tests for node functionality"""
 
-import pytest
 import asyncio
-from unittest.mock import Mock, AsyncMock, patch
+import pytest
+from unittest.mock import Mock, AsyncMock
 from src.nodes import (
     query_analyzer, topic_validator, quiz_generator, 
-    answer_validator, score_generator,
+    answer_validator, score_generator, classify_intents_batch,
     validate_multiple_choice_answer, validate_true_false_answer,
     determine_question_type, get_difficulty_multiplier, get_question_type_bonus,
     calculate_performance_trend, validate_node_prerequisites,
@@ -20,7 +20,7 @@ class TestNodePrerequisites:
         """Test query analyzer prerequisites"""
         state = QuizState()
         errors = validate_node_prerequisites(state, "query_analyzer")
-        assert "user_input" in str(errors)
+        assert any("user_input" in error for error in errors)
         
         state.user_input = "test input"
         errors = validate_node_prerequisites(state, "query_analyzer")
@@ -30,7 +30,7 @@ class TestNodePrerequisites:
         """Test topic validator prerequisites"""
         state = QuizState()
         errors = validate_node_prerequisites(state, "topic_validator")
-        assert "user_input" in str(errors)
+        assert any("user_input" in error for error in errors)
     
     def test_quiz_generator_prerequisites(self):
         """Test quiz generator prerequisites"""
@@ -70,11 +70,10 @@ class TestNodePrerequisites:
 class TestQueryAnalyzer:
     """Test Query Analyzer node"""
     
-    @patch('src.nodes.query_analyzer.safe_llm_call', new_callable=AsyncMock)
-    def test_query_analyzer_success(self, mock_llm_call):
+    def test_query_analyzer_success(self, patched_llm_call):
         """Test successful query analysis"""
         # Mock LLM response using AsyncMock
-        mock_llm_call.return_value = '{"intent": "start_quiz", "confidence": 0.9, "reasoning": "User wants to start"}'
+        patched_llm_call.return_value = '{"intent": "start_quiz", "confidence": 0.9, "reasoning": "User wants to start"}'
         
         state = QuizState()
         state.user_input = "I want a quiz about Python"
@@ -86,10 +85,9 @@ class TestQueryAnalyzer:
         assert len(result.conversation_history) > 0
         assert result.last_error is None
     
-    @patch('src.nodes.query_analyzer.safe_llm_call')
-    def test_query_analyzer_llm_error(self, mock_llm_call):
+    def test_query_analyzer_llm_error(self, patched_llm_call):
         """Test query analyzer with LLM error"""
-        mock_llm_call.side_effect = Exception("LLM error")
+        patched_llm_call.side_effect = Exception("LLM error")
         
         state = QuizState()
         state.user_input = "test input"
@@ -100,25 +98,39 @@ class TestQueryAnalyzer:
         assert result.user_intent == "clarification"
         assert result.last_error is not None
     
-    def test_query_analyzer_empty_input(self):
+    def test_query_analyzer_empty_input(self, dummy_llm):
         """Test query analyzer with empty input"""
         state = QuizState()
         state.user_input = ""
         
-        llm = AsyncMock()
-        result = query_analyzer(state, llm)
+        result = query_analyzer(state, dummy_llm)
         
         assert result.last_error is not None
         assert "Empty user input" in result.last_error
+    
+    @pytest.mark.parametrize("failure", [Exception("LLM error"), asyncio.CancelledError()],
+                             ids=["error", "cancelled"])
+    async def test_classify_intents_batch(self, patched_llm_call, failure):
+        """Test batched intent classification keeps order and isolates failures"""
+        patched_llm_call.side_effect = [
+            '{"intent": "start_quiz", "confidence": 0.9}',
+            failure,
+        ]
+        
+        states = [QuizState(user_input="Quiz me on Python"), QuizState(user_input="exit")]
+        results = await classify_intents_batch(states, AsyncMock())
+        
+        assert patched_llm_call.call_count == 2
+        assert results[0]["intent"] == "start_quiz"
+        assert "error" in results[1]
 
 class TestTopicValidator:
     """Test Topic Validator node"""
     
-    @patch('src.nodes.query_analyzer.safe_llm_call', new_callable=AsyncMock)
-    def test_topic_validator_success(self, mock_llm_call):
+    def test_topic_validator_success(self, patched_llm_call):
         """Test successful topic validation"""
         # Mock responses for extraction and validation
-        mock_llm_call.side_effect = [
+        patched_llm_call.side_effect = [
             '{"topic": "Python Programming", "confidence": 0.9}',
             '{"is_valid": true, "category": "programming", "difficulty_level": "intermediate"}'
         ]
@@ -134,10 +146,9 @@ class TestTopicValidator:
         assert result.current_phase == "quiz_active"
         assert result.quiz_active is True
     
-    @patch('src.nodes.query_analyzer.safe_llm_call', new_callable=AsyncMock)
-    def test_topic_validator_invalid_topic(self, mock_llm_call):
+    def test_topic_validator_invalid_topic(self, patched_llm_call):
         """Test topic validation with invalid topic"""
-        mock_llm_call.side_effect = [
+        patched_llm_call.side_effect = [
             '{"topic": "Inappropriate Topic", "confidence": 0.8}',
             '{"is_valid": false, "reason": "Topic not suitable", "suggestions": ["Alternative Topic"]}'
         ]
@@ -155,10 +166,9 @@ class TestTopicValidator:
 class TestQuizGenerator:
     """Test Quiz Generator node"""
     
-    @patch('src.nodes.query_analyzer.safe_llm_call', new_callable=AsyncMock)
-    def test_quiz_generator_success(self, mock_llm_call):
+    def test_quiz_generator_success(self, patched_llm_call):
         """Test successful question generation"""
-        mock_llm_call.return_value = '''{
+        patched_llm_call.return_value = '''{
             "question": "What is a Python list?",
             "type": "open_ended",
             "correct_answer": "A mutable sequence of items",
@@ -175,31 +185,26 @@ class TestQuizGenerator:
         assert result.correct_answer == "A mutable sequence of items"
         assert result.last_error is None
     
-    def test_quiz_generator_missing_topic(self):
+    def test_quiz_generator_missing_topic(self, dummy_llm):
         """Test quiz generator with missing topic"""
         state = QuizState()
         
-        llm = AsyncMock()
-        result = quiz_generator(state, llm)
+        result = quiz_generator(state, dummy_llm)
         
         assert result.last_error is not None
         assert "without validated topic" in result.last_error
     
-    def test_determine_question_type(self):
+    @pytest.mark.parametrize("answered,expected", [
+        (0, "multiple_choice"),  # First question
+        (3, "open_ended"),       # Every third question
+        (4, "true_false")        # Every fourth question
+    ])
+    def test_determine_question_type(self, answered, expected):
         """Test question type determination logic"""
         state = QuizState()
+        state.total_questions_answered = answered
         
-        # First question should be multiple choice
-        state.total_questions_answered = 0
-        assert determine_question_type(state) == "multiple_choice"
-        
-        # Every third question should be open ended
-        state.total_questions_answered = 3
-        assert determine_question_type(state) == "open_ended"
-        
-        # Every fourth question should be true/false
-        state.total_questions_answered = 4
-        assert determine_question_type(state) == "true_false"
+        assert determine_question_type(state) == expected
 
 class TestAnswerValidator:
     """Test Answer Validator node"""
@@ -239,10 +244,9 @@ class TestAnswerValidator:
         assert result["is_correct"] is True
         assert result["score_percentage"] == 100
     
-    @patch('src.nodes.query_analyzer.safe_llm_call', new_callable=AsyncMock)
-    def test_answer_validator_open_ended(self, mock_llm_call):
+    def test_answer_validator_open_ended(self, patched_llm_call):
         """Test answer validator with open-ended question"""
-        mock_llm_call.return_value = '''{
+        patched_llm_call.return_value = '''{
             "is_correct": true,
             "partial_credit": false,
             "score_percentage": 85,
@@ -263,7 +267,7 @@ class TestAnswerValidator:
 class TestScoreGenerator:
     """Test Score Generator node"""
     
-    def test_score_generator_correct_answer(self):
+    def test_score_generator_correct_answer(self, dummy_llm):
         """Test score generation for correct answer"""
         state = create_test_state()
         state.answer_is_correct = True
@@ -273,14 +277,13 @@ class TestScoreGenerator:
         
         initial_score = state.total_score
         
-        llm = AsyncMock()
-        result = score_generator(state, llm)
+        result = score_generator(state, dummy_llm)
         
         assert result.total_score > initial_score
         assert result.total_questions_answered == 1
         assert result.correct_answers_count == 1
     
-    def test_score_generator_incorrect_answer(self):
+    def test_score_generator_incorrect_answer(self, dummy_llm):
         """Test score generation for incorrect answer"""
         state = create_test_state()
         state.answer_is_correct = False
@@ -288,62 +291,54 @@ class TestScoreGenerator:
         
         initial_score = state.total_score
         
-        llm = AsyncMock()
-        result = score_generator(state, llm)
+        result = score_generator(state, dummy_llm)
         
         assert result.total_score == initial_score  # No points added
         assert result.total_questions_answered == 1
         assert result.correct_answers_count == 0
     
-    def test_score_generator_quiz_completion(self):
+    def test_score_generator_quiz_completion(self, dummy_llm):
         """Test quiz completion detection"""
         state = create_test_state()
         state.answer_is_correct = True
         state.max_questions = 1
         state.total_questions_answered = 0  # Will become 1 after processing
         
-        llm = AsyncMock()
-        result = score_generator(state, llm)
+        result = score_generator(state, dummy_llm)
         
         assert result.quiz_completed is True
         assert result.quiz_active is False
         assert result.current_phase == "quiz_complete"
     
-    def test_get_difficulty_multiplier(self):
+    @pytest.mark.parametrize("level,expected", [
+        ("easy", 0.8),
+        ("hard", 1.5),
+        ("unknown", 1.0)
+    ])
+    def test_get_difficulty_multiplier(self, level, expected):
         """Test difficulty multiplier calculation"""
         state = QuizState()
+        state.quiz_metadata["difficulty_level"] = level
         
-        state.quiz_metadata["difficulty_level"] = "easy"
-        assert get_difficulty_multiplier(state) == 0.8
-        
-        state.quiz_metadata["difficulty_level"] = "hard"
-        assert get_difficulty_multiplier(state) == 1.5
-        
-        state.quiz_metadata["difficulty_level"] = "unknown"
-        assert get_difficulty_multiplier(state) == 1.0
+        assert get_difficulty_multiplier(state) == expected
     
-    def test_get_question_type_bonus(self):
+    @pytest.mark.parametrize("question_type,expected", [
+        ("multiple_choice", 0),
+        ("open_ended", 5),
+        ("fill_in_blank", 3)
+    ])
+    def test_get_question_type_bonus(self, question_type, expected):
         """Test question type bonus calculation"""
-        assert get_question_type_bonus("multiple_choice") == 0
-        assert get_question_type_bonus("open_ended") == 5
-        assert get_question_type_bonus("fill_in_blank") == 3
+        assert get_question_type_bonus(question_type) == expected
     
-    def test_calculate_performance_trend(self):
+    @pytest.mark.parametrize("answers,expected", [
+        ([{"is_correct": True}], "insufficient_data"),
+        ([{"is_correct": True}] * 5, "strong"),
+        ([{"is_correct": False}] * 5, "struggling")
+    ])
+    def test_calculate_performance_trend(self, answers, expected):
         """Test performance trend calculation"""
-        # Insufficient data
-        answers = [{"is_correct": True}]
-        trend = calculate_performance_trend(answers)
-        assert trend == "insufficient_data"
-        
-        # Strong performance
-        answers = [{"is_correct": True} for _ in range(5)]
-        trend = calculate_performance_trend(answers)
-        assert trend == "strong"
-        
-        # Poor performance
-        answers = [{"is_correct": False} for _ in range(5)]
-        trend = calculate_performance_trend(answers)
-        assert trend == "struggling"
+        assert calculate_performance_trend(answers) == expected
 
 class TestNodeExecution:
     """Test node execution utilities"""
@@ -396,7 +391,7 @@ class TestNodeConfiguration:
         """Test validation of unknown node"""
         state = QuizState()
         errors = validate_node_prerequisites(state, "unknown_node")
-        assert "Unknown node" in str(errors)
+        assert any("Unknown node" in error for error in errors)
 
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import pytest
 import json
+import re
 from src.prompts import (
     PromptManager, PromptType, PromptTemplate,
     format_intent_classification_prompt, format_topic_extraction_prompt,
@@ -12,6 +13,19 @@ from src.prompts import (
 )
 from src.state import QuizState, create_test_state
 
+# Single-name {placeholder}; one scan per template instead of one per variable
+_PLACEHOLDER_PATTERN = re.compile(r'\{(\w+)\}')
+
+@pytest.fixture(scope="module")
+def manager():
+    """One PromptManager shared by the tests that only read its templates"""
+    return PromptManager()
+
+@pytest.fixture(scope="module")
+def test_prompts():
+    """create_test_prompts() output, built once since tests only read it"""
+    return create_test_prompts()
+
 class TestPromptManager:
     """Test PromptManager functionality"""
     
@@ -37,19 +51,15 @@ class TestPromptManager:
             assert template.template  # Template should not be empty
             assert template.required_vars  # Should have required variables
     
-    def test_get_template(self):
+    def test_get_template(self, manager):
         """Test getting template by type"""
-        manager = PromptManager()
-        
         template = manager.get_template(PromptType.INTENT_CLASSIFICATION)
         assert template.name == "intent_classification"
         assert "CURRENT CONTEXT" in template.template
         assert "user_input" in template.required_vars
     
-    def test_format_prompt_success(self):
+    def test_format_prompt_success(self, manager):
         """Test successful prompt formatting"""
-        manager = PromptManager()
-        
         formatted = manager.format_prompt(
             PromptType.TOPIC_EXTRACTION,
             user_input="I want to learn about Python"
@@ -58,20 +68,16 @@ class TestPromptManager:
         assert "I want to learn about Python" in formatted
         assert "{user_input}" not in formatted  # Should be replaced
     
-    def test_format_prompt_missing_required_vars(self):
+    def test_format_prompt_missing_required_vars(self, manager):
         """Test prompt formatting with missing required variables"""
-        manager = PromptManager()
-        
         with pytest.raises(ValueError) as exc_info:
             manager.format_prompt(PromptType.TOPIC_EXTRACTION)
         
         assert "Missing required variables" in str(exc_info.value)
         assert "user_input" in str(exc_info.value)
     
-    def test_format_prompt_with_optional_vars(self):
+    def test_format_prompt_with_optional_vars(self, manager):
         """Test prompt formatting with optional variables"""
-        manager = PromptManager()
-        
         # This should work with defaults for optional vars
         formatted = manager.format_prompt(
             PromptType.ANSWER_VALIDATION,
@@ -87,6 +93,19 @@ class TestPromptManager:
 class TestPromptFormatting:
     """Test prompt formatting functions"""
     
+    @pytest.mark.parametrize("template,kwargs", [
+        ("{{literal}} {name}", {"name": "x"}),
+        ("{name!r} {name!s:>5}", {"name": "x"}),
+        ("{items[0]} {items[1]}", {"items": ["a", "b"]}),
+        ("{score.real:.1f}", {"score": 3}),
+        ("{name:{width}}|{score:>{width}.{digits}f}", {"name": "x", "width": 4, "score": 2.5, "digits": 2})
+    ])
+    def test_template_format_matches_str_format(self, template, kwargs):
+        """Test PromptTemplate.format handles escapes, conversions, indexed and nested fields"""
+        prompt = PromptTemplate(name="t", template=template, required_vars=list(kwargs))
+        
+        assert prompt.format(**kwargs) == template.format(**kwargs)
+    
     def test_intent_classification_formatting(self):
         """Test intent classification prompt formatting"""
         state = create_test_state()
@@ -215,10 +234,8 @@ class TestPromptValidation:
 class TestPromptIntegration:
     """Test prompt integration with state"""
     
-    def test_create_test_prompts(self):
+    def test_create_test_prompts(self, test_prompts):
         """Test test prompt creation"""
-        test_prompts = create_test_prompts()
-        
         expected_types = [
             "intent_classification", "topic_extraction", "topic_validation",
             "question_generation", "answer_validation", "clarification", "summary"
@@ -229,10 +246,8 @@ class TestPromptIntegration:
             assert isinstance(test_prompts[prompt_type], str)
             assert len(test_prompts[prompt_type]) > 100  # Should be substantial
     
-    def test_prompt_template_consistency(self):
+    def test_prompt_template_consistency(self, manager):
         """Test that all templates have consistent structure"""
-        manager = PromptManager()
-        
         for prompt_type, template in manager.templates.items():
             # All templates should have basic metadata
             assert template.name
@@ -241,9 +256,9 @@ class TestPromptIntegration:
             assert template.description
             
             # Templates should contain their required variables as placeholders
-            for var in template.required_vars:
-                placeholder = "{" + var + "}"
-                assert placeholder in template.template, f"Template {template.name} missing placeholder for {var}"
+            found = set(_PLACEHOLDER_PATTERN.findall(template.template))
+            missing = set(template.required_vars) - found
+            assert not missing, f"Template {template.name} missing placeholders for {sorted(missing)}"
     
     def test_state_integration(self):
         """Test prompt formatting with actual state objects"""
@@ -1,11 +1,15 @@
 """Tests for state management functionality"""
 
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime
 from src.state import (
-    QuizState, validate_state_consistency, validate_state_transition,
-    serialize_state, deserialize_state, create_initial_state, create_test_state
+    QuizState, validate_state_consistency, validate_state_transition, first_validation_error,
+    serialize_state, serialize_state_bytes, deserialize_state, peek_serialized_at,
+    deserialize_state_lazy,
+    create_initial_state, create_test_state
 )
+from src.state.state_middleware import validate_state_middleware
+from src.state.quiz_state import MAX_CONVERSATION_HISTORY
 
 class TestQuizState:
     """Test QuizState class functionality"""
@@ -37,6 +41,16 @@ class TestQuizState:
         assert entry["phase"] == "topic_selection"
         assert "timestamp" in entry
     
+    def test_conversation_history_is_bounded(self):
+        """Test conversation history drops the oldest entries past the cap"""
+        state = QuizState()
+        
+        for i in range(MAX_CONVERSATION_HISTORY + 5):
+            state.add_conversation_entry(f"message {i}")
+        
+        assert len(state.conversation_history) == MAX_CONVERSATION_HISTORY
+        assert state.conversation_history[0]["user"] == "message 5"
+    
     def test_answer_record_management(self):
         """Test answer recording functionality"""
         state = QuizState()
@@ -71,6 +85,7 @@ class TestQuizState:
         state.add_conversation_entry("test", "response")
         
         original_session_id = state.session_id
+        original_history = state.conversation_history
         
         # Reset quiz
         state.reset_for_new_quiz()
@@ -86,6 +101,7 @@ class TestQuizState:
         # Check preserved fields
         assert state.session_id == original_session_id
         assert len(state.conversation_history) == 1  # Preserved
+        assert state.conversation_history is original_history  # Kept in place, not copied
     
     def test_question_increment(self):
         """Test question increment functionality"""
@@ -99,7 +115,25 @@ class TestQuizState:
         assert state.current_question_index == 6
         assert state.current_question is None
         assert state.current_answer is None
-    
+
+    def test_apply_update(self):
+        """Test batched conversation entry and field update"""
+        state = create_test_state(current_phase="quiz_active", user_input="help")
+
+        state.apply_update(
+            conversation_entry=("help", "Here is some help"),
+            user_input="",
+            current_phase="quiz_complete"
+        )
+
+        assert state.user_input == ""
+        assert state.current_phase == "quiz_complete"
+        assert state.conversation_history[-1]["system"] == "Here is some help"
+        assert state.conversation_history[-1]["phase"] == "quiz_active"
+
+        with pytest.raises(ValueError):
+            state.apply_update(not_a_field=1)
+
     def test_accuracy_calculation(self):
         """Test accuracy calculation"""
         state = QuizState()
@@ -161,6 +195,16 @@ class TestStateValidation:
         assert any("Quiz cannot be active without validated topic" in error for error in errors)
         assert any("Correct answers cannot exceed total answered" in error for error in errors)
     
+    def test_first_validation_error(self):
+        """Test first_validation_error matches the head of the full error list"""
+        assert first_validation_error(create_test_state()) is None
+        
+        state = QuizState()
+        state.quiz_active = True
+        state.correct_answers_count = 5
+        
+        assert first_validation_error(state) == validate_state_consistency(state)[0]
+    
     def test_state_transition_validation(self):
         """Test state transition validation"""
         old_state = create_test_state()
@@ -217,6 +261,57 @@ class TestStateSerialization:
         assert restored_state.quiz_active is True
         assert restored_state.session_id == original_state.session_id
     
+    def test_state_deserialization_from_bytes(self):
+        """Test bytes serialization round-trip without a str intermediary"""
+        original_state = create_test_state(topic="Python Programming")
+        
+        restored_state = deserialize_state(serialize_state_bytes(original_state))
+        
+        assert restored_state.topic == "Python Programming"
+        assert restored_state.created_at == original_state.created_at
+    
+    def test_compact_serialization(self):
+        """Test compact bytes round-trip without indentation"""
+        original_state = create_test_state(topic="Compact Topic")
+        original_state.add_conversation_entry("Hello", "Hi there")
+        
+        compact = serialize_state_bytes(original_state, compact=True)
+        
+        assert b"\n" not in compact
+        assert len(compact) < len(serialize_state_bytes(original_state))
+        
+        restored_state = deserialize_state(compact)
+        assert restored_state.topic == "Compact Topic"
+        assert restored_state.conversation_history == original_state.conversation_history
+    
+    def test_peek_serialized_at(self):
+        """Test reading the snapshot time from the payload prefix"""
+        state = create_test_state()
+        
+        for payload in (serialize_state(state), serialize_state_bytes(state, compact=True)):
+            serialized_at = peek_serialized_at(payload)
+            assert isinstance(serialized_at, datetime)
+            assert serialized_at >= state.updated_at
+        
+        assert peek_serialized_at('{"topic": "No header"}') is None
+    
+    def test_lazy_deserialization(self):
+        """Test lazy view reads fields without validating the full state"""
+        state = create_test_state(topic="Lazy Topic")
+        state.total_score = 30
+        
+        lazy_state = deserialize_state_lazy(serialize_state_bytes(state, compact=True))
+        
+        assert lazy_state.topic == "Lazy Topic"
+        assert lazy_state.total_score == 30
+        assert lazy_state.to_state().session_id == state.session_id
+        
+        with pytest.raises(AttributeError):
+            lazy_state.not_a_field
+        
+        with pytest.raises(ValueError):
+            deserialize_state_lazy("invalid json").topic
+    
     def test_invalid_deserialization(self):
         """Test handling of invalid JSON"""
         with pytest.raises(ValueError):
@@ -254,5 +349,32 @@ class TestStateFactories:
         assert state.quiz_active is True
 
 
+class TestStateMiddleware:
+    """Test validation middleware around node functions"""
+    
+    def test_read_only_node_is_post_validated(self, monkeypatch):
+        """Test post-validation runs even when the node changes nothing"""
+        calls = []
+        monkeypatch.setattr(
+            "src.state.state_middleware.first_validation_error",
+            lambda state: calls.append(state) or None
+        )
+        
+        node = validate_state_middleware(lambda state: state)
+        node(create_test_state())
+        
+        assert len(calls) == 2
+    
+    def test_mutating_node_is_post_validated(self):
+        """Test inconsistent node output is flagged"""
+        def break_state(state):
+            state.correct_answers_count = 5
+            return state
+        
+        result = validate_state_middleware(break_state)(create_test_state())
+        
+        assert "Post-execution validation failed" in result.last_error
+
+
 if __name__ == "__main__":
     pytest.main([__file__]) 
\ No newline at end of file
@@ -5,7 +5,7 @@ This script validates that the development environment is properly set up
 according to the specifications in 01-project-setup.md.
 
 Usage:
-    python validate_setup.py
+    python validate_setup.py [--no-cache]
 
 The script performs comprehensive checks on:
 - Python version compatibility
@@ -15,14 +15,45 @@ The script performs comprehensive checks on:
 - Git repository status
 - Development tools configuration
 
+Passing dependency and tool checks are cached for a day in
+~/.cache/quiz-me/validate.json; pass --no-cache to run them again.
+
 Returns exit code 0 on success, 1 on failure.
 """
 
+import hashlib
+import importlib.metadata
+import json
 import os
+import re
 import sys
+import shutil
 import subprocess
-from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, List, Dict, Set, Tuple, Optional
+
+# Cache of passing dependency and tool checks (stdlib json: this script
+# runs before requirements are installed)
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'quiz-me', 'validate.json')
+CACHE_MAX_AGE_SECONDS = 24 * 60 * 60
+# Files whose changes invalidate the cache
+CACHE_KEY_FILES = ['requirements.txt', '.pre-commit-config.yaml']
+# Distributions imported by check_dependencies; installing, upgrading or
+# removing any of them invalidates the cache
+CHECKED_DISTRIBUTIONS = ['gradio', 'pydantic', 'langchain', 'langgraph', 'openai']
+# Tools reported by check_development_tools
+DEV_TOOLS = ['pre-commit', 'black', 'isort', 'mypy', 'pytest']
+# Cached check results, each stored as a [success, details] pair
+CACHED_CHECKS = ['dependencies', 'development_tools']
+
+# Project modules (utils) are imported from src/ by the dependency and basic checks
+_SRC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+# Status text that print_section marks with a check instead of a warning
+_OK_STATUS_RE = re.compile(r'set|found|available|installed', re.IGNORECASE)
 
 def check_python_version() -> Tuple[bool, str]:
     """Check if Python version meets requirements"""
@@ -30,48 +61,70 @@ def check_python_version() -> Tuple[bool, str]:
         return False, f"Python 3.8+ required, found {sys.version}"
     return True, f"Python {sys.version.split()[0]}"
 
+# Project layout checked by check_required_files/check_required_directories
+REQUIRED_FILES = frozenset({
+    'requirements.txt',
+    '.env.example', 
+    '.gitignore',
+    'app.py',
+    'README.md',
+    'pytest.ini',
+    'mypy.ini',
+    '.pre-commit-config.yaml',
+    'src/__init__.py',
+    'src/utils.py',
+    'src/workflow.py',
+    'tests/__init__.py',
+    'tests/conftest.py'
+})
+REQUIRED_DIRS = frozenset({
+    'src',
+    'src/nodes',
+    'src/edges', 
+    'src/prompts',
+    'src/state',
+    'tests',
+    'docs'
+})
+
+def _collect_paths(paths: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """
+    List the directories that would contain the given paths.
+    
+    Each parent directory is read once with os.scandir, whose entries carry
+    their type, instead of stat-ing every path separately.
+    
+    Args:
+        paths: '/'-separated relative paths whose parent directories should be listed
+        
+    Returns:
+        (existing_files, existing_dirs) as '/'-separated relative paths
+    """
+    existing_files: Set[str] = set()
+    existing_dirs: Set[str] = set()
+    for parent in {os.path.dirname(p) or '.' for p in paths}:
+        try:
+            with os.scandir(parent) as entries:
+                for entry in entries:
+                    target = existing_dirs if entry.is_dir() else existing_files
+                    target.add(os.path.normpath(entry.path).replace(os.sep, '/'))
+        except OSError:
+            # Missing parent: everything under it is reported as missing
+            continue
+    return existing_files, existing_dirs
+
 def check_required_files() -> Tuple[bool, List[str]]:
     """Check if all required files exist"""
-    required_files = [
-        'requirements.txt',
-        '.env.example', 
-        '.gitignore',
-        'app.py',
-        'README.md',
-        'pytest.ini',
-        'mypy.ini',
-        '.pre-commit-config.yaml',
-        'src/__init__.py',
-        'src/utils.py',
-        'src/workflow.py',
-        'tests/__init__.py',
-        'tests/conftest.py'
-    ]
-    
-    missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
+    existing_files, _ = _collect_paths(REQUIRED_FILES)
+    missing_files = sorted(REQUIRED_FILES - existing_files)
     
     success = len(missing_files) == 0
     return success, missing_files
 
 def check_required_directories() -> Tuple[bool, List[str]]:
     """Check if all required directories exist"""
-    required_dirs = [
-        'src',
-        'src/nodes',
-        'src/edges', 
-        'src/prompts',
-        'src/state',
-        'tests',
-        'docs'
-    ]
-    
-    missing_dirs = []
-    for dir_path in required_dirs:
-        if not Path(dir_path).exists():
-            missing_dirs.append(dir_path)
+    _, existing_dirs = _collect_paths(REQUIRED_DIRS)
+    missing_dirs = sorted(REQUIRED_DIRS - existing_dirs)
     
     success = len(missing_dirs) == 0
     return success, missing_dirs
@@ -81,8 +134,7 @@ def check_environment_variables() -> Tuple[bool, Dict[str, str]]:
     env_status = {}
     
     # Load from .env if it exists
-    env_file = Path('.env')
-    if env_file.exists():
+    if os.path.exists('.env'):
         try:
             from dotenv import load_dotenv
             load_dotenv()
@@ -92,8 +144,11 @@ def check_environment_variables() -> Tuple[bool, Dict[str, str]]:
     else:
         env_status['.env file'] = 'Not found (use .env.example as template)'
     
+    # Read after load_dotenv so values from .env are included
+    env = os.environ
+    
     # Check critical environment variables
-    openai_key = os.getenv('OPENAI_API_KEY')
+    openai_key = env.get('OPENAI_API_KEY')
     if openai_key:
         # Mask the key for security
         masked_key = openai_key[:8] + '...' + openai_key[-4:] if len(openai_key) > 12 else '***'
@@ -103,12 +158,13 @@ def check_environment_variables() -> Tuple[bool, Dict[str, str]]:
     
     # Other optional environment variables
     optional_vars = ['OPENAI_MODEL', 'APP_TITLE', 'GRADIO_SERVER_PORT']
-    for var in optional_vars:
-        value = os.getenv(var)
-        env_status[var] = f'Set to: {value}' if value else 'Using default'
+    env_status.update({
+        var: f'Set to: {env[var]}' if env.get(var) else 'Using default'
+        for var in optional_vars
+    })
     
     # Success if at least .env.example exists (API key is optional for setup validation)
-    success = Path('.env.example').exists()
+    success = os.path.exists('.env.example')
     return success, env_status
 
 def check_dependencies() -> Tuple[bool, List[str]]:
@@ -122,7 +178,6 @@ def check_dependencies() -> Tuple[bool, List[str]]:
         import langgraph
         import openai
         # Import from our src module
-        sys.path.insert(0, 'src')
         from utils import Config
     except ImportError as e:
         import_errors.append(str(e))
@@ -130,51 +185,60 @@ def check_dependencies() -> Tuple[bool, List[str]]:
     success = len(import_errors) == 0
     return success, import_errors
 
+def start_dependency_check() -> "Future[Tuple[bool, List[str]]]":
+    """Run check_dependencies on a background thread and return its future"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(check_dependencies)
+    # Release the worker once the check finishes; the caller waits on the future
+    executor.shutdown(wait=False)
+    return future
+
 def check_git_repository() -> Tuple[bool, str]:
     """Check git repository status"""
     try:
-        # Check if we're in a git repository
-        result = subprocess.run(['git', 'rev-parse', '--git-dir'], 
-                              capture_output=True, text=True, check=True)
-        
-        # Check if there are any commits
-        result = subprocess.run(['git', 'log', '--oneline', '-1'], 
+        # One call answers both questions: exit 0 = has commits,
+        # 1 = repository without commits, 128 = not a repository
+        result = subprocess.run(['git', 'rev-parse', '--verify', '--quiet', 'HEAD'], 
                               capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            return True, "Git repository initialized with commits"
-        else:
-            return True, "Git repository initialized (no commits yet)"
-            
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except FileNotFoundError:
+        return False, "Not a git repository or git not installed"
+    
+    if result.returncode == 0:
+        return True, "Git repository initialized with commits"
+    elif result.returncode == 1:
+        return True, "Git repository initialized (no commits yet)"
+    else:
         return False, "Not a git repository or git not installed"
 
+def _tool_version(tool: str) -> Optional[str]:
+    """Return the tool's version output, or None if it is missing or fails"""
+    try:
+        result = subprocess.run([tool, '--version'], 
+                              capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
 def check_development_tools() -> Tuple[bool, Dict[str, str]]:
     """Check development tools configuration"""
     tools_status = {}
     
-    # Check pre-commit
-    try:
-        result = subprocess.run(['pre-commit', '--version'], 
-                              capture_output=True, text=True, check=True)
-        tools_status['pre-commit'] = f"Installed: {result.stdout.strip()}"
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    # Check pre-commit (the only tool whose version is reported)
+    version = _tool_version('pre-commit') if shutil.which('pre-commit') else None
+    if version is not None:
+        tools_status['pre-commit'] = f"Installed: {version}"
+    else:
         tools_status['pre-commit'] = "Not installed or not in PATH"
     
-    # Check if pre-commit is set up
-    if Path('.git/hooks/pre-commit').exists():
+    # Check if pre-commit is set up (lexists: the hook may be a symlink)
+    if os.path.lexists('.git/hooks/pre-commit'):
         tools_status['pre-commit hooks'] = "Installed"
     else:
         tools_status['pre-commit hooks'] = "Not installed (run: pre-commit install)"
     
-    # Check other tools
-    for tool in ['black', 'isort', 'mypy', 'pytest']:
-        try:
-            result = subprocess.run([tool, '--version'], 
-                                  capture_output=True, text=True, check=True)
-            tools_status[tool] = "Available"
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            tools_status[tool] = "Not available"
+    # Check other tools (a PATH lookup, no process launched)
+    for tool in DEV_TOOLS[1:]:
+        tools_status[tool] = "Available" if shutil.which(tool) else "Not available"
     
     # Success if most tools are available
     available_count = sum(1 for status in tools_status.values() if 'Available' in status or 'Installed' in status)
@@ -185,7 +249,6 @@ def run_basic_tests() -> Tuple[bool, str]:
     """Run basic validation tests"""
     try:
         # Test basic imports and configuration
-        sys.path.insert(0, 'src')
         from utils import Config, validate_environment_setup
         
         # Run environment validation
@@ -198,30 +261,88 @@ def run_basic_tests() -> Tuple[bool, str]:
     except Exception as e:
         return False, f"Basic test failed: {e}"
 
+def _installed_version(distribution: str) -> str:
+    """Installed version of a distribution, or "missing" """
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return "missing"
+
+def _cache_key() -> Optional[str]:
+    """Identify this interpreter, dependency spec and installed tools, or None if a key file is missing"""
+    try:
+        mtimes = [str(os.path.getmtime(path)) for path in CACHE_KEY_FILES]
+    except OSError:
+        return None
+    versions = [f"{name}={_installed_version(name)}" for name in CHECKED_DISTRIBUTIONS]
+    tools = [f"{tool}={shutil.which(tool)}" for tool in DEV_TOOLS]
+    parts = [sys.version, sys.executable, os.getcwd(), *mtimes, *versions, *tools]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+def load_cached_checks(key: Optional[str]) -> Dict[str, Any]:
+    """Return cached check results for this key, or {} if missing or stale"""
+    if key is None:
+        return {}
+    try:
+        with open(CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(cached, dict) or cached.get('key') != key:
+        return {}
+    # A hand-edited file must not reach validate_environment
+    created = cached.get('created')
+    if not isinstance(created, (int, float)) or time.time() - created >= CACHE_MAX_AGE_SECONDS:
+        return {}
+    for check in CACHED_CHECKS:
+        entry = cached.get(check)
+        if not isinstance(entry, list) or len(entry) != 2:
+            return {}
+    return cached
+
+def save_cached_checks(key: Optional[str], results: Dict[str, Any]) -> None:
+    """Store check results for this key; failures to write are ignored"""
+    if key is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'created': time.time(), **results}, f)
+    except OSError:
+        pass
+
 def print_section(title: str, success: bool, details: any = None):
     """Print a validation section with consistent formatting"""
     status_icon = "✅" if success else "❌"
-    print(f"\n{status_icon} {title}")
+    # Build the section and write it at once; sections still appear as each check finishes
+    lines = [f"\n{status_icon} {title}"]
     
     if details:
         if isinstance(details, list):
             if not success and details:  # Show errors/missing items
-                for item in details:
-                    print(f"   • {item}")
+                lines.extend(f"   • {item}" for item in details)
         elif isinstance(details, dict):
             for key, value in details.items():
-                status = "✅" if any(word in value.lower() for word in ['set', 'found', 'available', 'installed']) else "⚠️"
-                print(f"   {status} {key}: {value}")
+                status = "✅" if _OK_STATUS_RE.search(value) else "⚠️"
+                lines.append(f"   {status} {key}: {value}")
         elif isinstance(details, str):
-            print(f"   {details}")
+            lines.append(f"   {details}")
+    
+    print("\n".join(lines))
 
-def validate_environment() -> bool:
+def validate_environment(use_cache: bool = True) -> bool:
     """Main validation function"""
     print("🔍 Interactive Quiz Generator - Setup Validation")
     print("=" * 55)
     
     all_checks_passed = True
     
+    # Reuse passing dependency/tool checks while the environment is unchanged
+    cache_key = _cache_key() if use_cache else None
+    cached = load_cached_checks(cache_key)
+    cached_suffix = " (cached)" if cached else ""
+    
     # Python version check
     success, message = check_python_version()
     print_section("Python Version", success, message)
@@ -242,45 +363,66 @@ def validate_environment() -> bool:
     print_section("Environment Configuration", success, env_status)
     # Don't fail overall validation for missing API key in development
     
+    # Import the heavy dependencies in the background while git is queried
+    # (started after .env is loaded, so import-time settings still see it)
+    dependency_check = None if cached else start_dependency_check()
+    git_status = check_git_repository()
+    
     # Dependencies check
-    success, import_errors = check_dependencies()
-    print_section("Dependencies", success, import_errors if not success else "All core dependencies available")
+    dependencies: Tuple[bool, List[str]] = (
+        dependency_check.result() if dependency_check else tuple(cached['dependencies'])
+    )
+    success, import_errors = dependencies
+    print_section("Dependencies" + cached_suffix, success,
+                  import_errors if not success else "All core dependencies available")
     all_checks_passed &= success
     
     # Git repository check
-    success, message = check_git_repository()
+    success, message = git_status
     print_section("Git Repository", success, message)
     # Don't fail overall validation for git issues
     
     # Development tools check
-    success, tools_status = check_development_tools()
-    print_section("Development Tools", success, tools_status)
+    development_tools: Tuple[bool, Dict[str, str]] = tuple(cached['development_tools']) if cached else check_development_tools()
+    success, tools_status = development_tools
+    print_section("Development Tools" + cached_suffix, success, tools_status)
     # Don't fail overall validation for missing dev tools
     
+    # Only passing results are cached, so fixes are picked up on the next run
+    if not cached and dependencies[0] and development_tools[0]:
+        save_cached_checks(cache_key, {
+            'dependencies': dependencies,
+            'development_tools': development_tools
+        })
+    
     # Basic tests
     success, message = run_basic_tests()
     print_section("Basic Tests", success, message)
     all_checks_passed &= success
     
     # Final summary
-    print("\n" + "=" * 55)
     if all_checks_passed:
-        print("🎉 Setup validation completed successfully!")
-        print("📋 Next step: Proceed to 02-state-management.md")
-        print("\n💡 To start the application: python app.py")
+        summary = [
+            "🎉 Setup validation completed successfully!",
+            "📋 Next step: Proceed to 02-state-management.md",
+            "\n💡 To start the application: python app.py"
+        ]
     else:
-        print("⚠️  Setup validation found issues that need attention.")
-        print("📖 Please refer to 01-project-setup.md for detailed setup instructions.")
-        print("\n🔧 Common fixes:")
-        print("   • Run: pip install -r requirements.txt")
-        print("   • Copy: cp .env.example .env (and add your OpenAI API key)")
-        print("   • Run: pre-commit install")
+        summary = [
+            "⚠️  Setup validation found issues that need attention.",
+            "📖 Please refer to 01-project-setup.md for detailed setup instructions.",
+            "\n🔧 Common fixes:",
+            "   • Run: pip install -r requirements.txt",
+            "   • Copy: cp .env.example .env (and add your OpenAI API key)",
+            "   • Run: pre-commit install"
+        ]
+    print("\n".join(["\n" + "=" * 55, *summary]))
     
     return all_checks_passed
 
 if __name__ == "__main__":
     try:
-        success = validate_environment()
+        success = validate_environment(use_cache='--no-cache' not in sys.argv[1:])
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         print("\n\n⚠️  Validation interrupted by user")